@@ -0,0 +1,186 @@
+"""
+Benchmarks for the date and time dimensions.  Writes the results as JSON so runs from different versions can be
+compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+import date_dimension
+import key_codec
+import time_dimension
+
+DATE_RANGES = {
+    "1y": (date(2023, 1, 1), date(2023, 12, 31)),
+    "10y": (date(2020, 1, 1), date(2029, 12, 31)),
+    "2000-2050": (date(2000, 1, 1), date(2050, 12, 31)),
+    "1970-2100": (date(1970, 1, 1), date(2100, 12, 31)),
+}
+SAMPLE_DATE_KEYS = [20000101, 20040229, 20121124, 20231127, 20231225, 20350704, 20501231]
+SAMPLE_TIME_KEYS = [0, 5, 959, 120000, 134512, 235959]
+ARRAY_SIZE = 1_000_000
+
+
+def measure(fn, repeat, number=1):
+    """
+    Takes a callable and returns the best and median seconds per call over repeat rounds of number calls.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return min(times), statistics.median(times)
+
+
+def peak_memory(fn):
+    """
+    Takes a callable and returns the peak bytes traced by tracemalloc while it runs.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def cases():
+    """
+    Yields (group, name, callable, calls per round, measure memory) for every benchmark.
+    """
+    import numpy as np
+
+    for label, (start, end) in DATE_RANGES.items():
+        yield "build", f"date_dimension.create_dataframe[{label}]", (
+            lambda s=start, e=end: date_dimension.create_dataframe(s, e)
+        ), 1, True
+    yield "build", "date_dimension.create_dataframe[compact]", (
+        lambda: date_dimension.create_dataframe(compact=True)
+    ), 1, True
+    for grain in time_dimension.GRAINS:
+        yield "build", f"time_dimension.create_dataframe[{grain}]", (
+            lambda g=grain: time_dimension.create_dataframe(g)
+        ), 1, True
+    yield "build", "time_dimension.create_dataframe[compact]", (
+        lambda: time_dimension.create_dataframe(compact=True)
+    ), 1, True
+
+    def clear_holiday_caches():
+        date_dimension.holiday_index.cache_clear()
+        date_dimension.peak_week_index.cache_clear()
+
+    for name in ["is_holiday", "holiday_name", "is_peak_week"]:
+        fn = getattr(date_dimension, name)
+
+        def cold(fn=fn):
+            clear_holiday_caches()
+            for k in SAMPLE_DATE_KEYS:
+                fn(k)
+
+        yield "holidays", f"date_dimension.{name}[cold]", cold, 1, False
+        yield "holidays", f"date_dimension.{name}[warm]", (
+            lambda fn=fn: [fn(k) for k in SAMPLE_DATE_KEYS]
+        ), 100, False
+
+    for name in date_dimension.COLUMN_FUNCTIONS:
+        if name in ("is_holiday", "holiday_name", "is_peak_week"):
+            continue
+        fn = date_dimension.COLUMN_FUNCTIONS[name]
+        yield "scalar", f"date_dimension.{name}", (lambda fn=fn: [fn(k) for k in SAMPLE_DATE_KEYS]), 100, False
+    for name in time_dimension.COLUMNS[1:]:
+        fn = getattr(time_dimension, name)
+        yield "scalar", f"time_dimension.{name}", (lambda fn=fn: [fn(k) for k in SAMPLE_TIME_KEYS]), 100, False
+
+    yield "codec", "key_codec.encode_date", (lambda: key_codec.encode_date(2023, 11, 24)), 1000, False
+    yield "codec", "key_codec.decode_date", (lambda: key_codec.decode_date(20231124)), 1000, False
+    yield "codec", "key_codec.decode_time", (lambda: key_codec.decode_time(134512)), 1000, False
+    days = np.arange(ARRAY_SIZE) % 40000
+    keys = key_codec.day_numbers_to_keys(days)
+    seconds = np.arange(ARRAY_SIZE) % 86400
+    time_keys = key_codec.seconds_to_time_keys(seconds)
+    yield "codec", "key_codec.day_numbers_to_keys[1M]", (lambda: key_codec.day_numbers_to_keys(days)), 1, True
+    yield "codec", "key_codec.keys_to_day_numbers[1M]", (lambda: key_codec.keys_to_day_numbers(keys)), 1, True
+    yield "codec", "key_codec.seconds_to_time_keys[1M]", (lambda: key_codec.seconds_to_time_keys(seconds)), 1, True
+    yield "codec", "key_codec.time_keys_to_seconds[1M]", (
+        lambda: key_codec.time_keys_to_seconds(time_keys)
+    ), 1, True
+
+
+def run(repeat, only=None):
+    """
+    Runs the benchmarks whose name contains only (default: all) and returns the results as a dict.
+    """
+    import numpy
+    import pandas
+
+    results = []
+    for group, name, fn, number, memory in cases():
+        if only and only not in name:
+            continue
+        fn()  # warm up imports and caches
+        best, median = measure(fn, repeat, number)
+        result = {"group": group, "name": name, "best_s": best, "median_s": median, "repeat": repeat}
+        if memory:
+            result["peak_bytes"] = peak_memory(fn)
+        results.append(result)
+        print(f"{name:60} {best * 1000:12.4f} ms", file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def compare(current, baseline):
+    """
+    Takes two result dicts and prints the best time of each benchmark in both and their ratio to stderr,
+    so the JSON results on stdout stay machine-readable.
+    """
+    before = {r["name"]: r for r in baseline["results"]}
+    for r in current["results"]:
+        if r["name"] in before:
+            old = before[r["name"]]["best_s"]
+            print(
+                f"{r['name']:60} {old * 1000:12.4f} ms -> {r['best_s'] * 1000:12.4f} ms  x{old / r['best_s']:.2f}",
+                file=sys.stderr,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per benchmark (default: 5)")
+    parser.add_argument("--only", help="run only the benchmarks whose name contains this text")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+from date_lookup import DateLookup
+
+
+class BusinessDays:
+    """
+    Business-day arithmetic over a date dimension table.  A cumulative count of the business days (not
+    is_weekend and not the holiday column) up to every row answers offset and difference queries with
+    two array reads, whatever the distance between the dates.
+    """
+
+    def __init__(self, table, holiday_column="is_holiday"):
+        self.index = DateLookup(table[["date_key"]])
+        self.keys = self.index.keys
+        self.business = ~table["is_weekend"].to_numpy(dtype=bool) & ~table[holiday_column].to_numpy(dtype=bool)
+        # counts[i] is the number of business days in the rows before row i
+        self.counts = np.zeros(len(self.keys) + 1, dtype=np.int64)
+        np.cumsum(self.business, out=self.counts[1:])
+        # row position of the n-th business day
+        self.business_positions = np.flatnonzero(self.business)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def is_business_day(self, k):
+        """
+        Takes a date_key and returns True if it is a business day.  Raises KeyError if it is not in the table.
+        """
+        return bool(self.business[self.index.position(k)])
+
+    def between(self, a, b):
+        """
+        Takes two date_keys and returns the number of business days after a up to and including b,
+        negative when b is before a.  Raises KeyError if either is not in the table.
+        """
+        return int(self.counts[self.index.position(b) + 1] - self.counts[self.index.position(a) + 1])
+
+    def between_many(self, a, b):
+        """
+        Takes two arrays of date_keys and returns between() of each pair as an int64 array.
+        Raises KeyError if any key is not in the table.
+        """
+        return self.counts[self._positions(b) + 1] - self.counts[self._positions(a) + 1]
+
+    def offset(self, k, n):
+        """
+        Takes a date_key and a number of business days and returns the date_key n business days after k,
+        or before k when n is negative (k itself when n is 0).  Raises KeyError if k is not in the table
+        and ValueError if the result falls outside it.
+        """
+        pos = self.index.position(k)
+        if n == 0:
+            return int(k)
+        rank = (self.counts[pos + 1] if n > 0 else self.counts[pos] + 1) + n
+        if not 1 <= rank <= len(self.business_positions):
+            raise ValueError(f"{n} business days from {k} is outside the table")
+        return int(self.keys[self.business_positions[rank - 1]])
+
+    def offset_many(self, keys, n):
+        """
+        Takes an array of date_keys and a number of business days (or an array of them) and returns offset()
+        of each as an int64 array.  Raises KeyError if any key is not in the table and ValueError if any result
+        falls outside it.
+        """
+        pos = self._positions(keys)
+        n = np.broadcast_to(np.asarray(n, dtype=np.int64), pos.shape)
+        # rank of the target among the business days: counted from the last business day up to k going
+        # forward, and from the first business day before k going back
+        rank = np.where(n > 0, self.counts[pos + 1], self.counts[pos] + 1) + n
+        outside = (n != 0) & ((rank < 1) | (rank > len(self.business_positions)))
+        if outside.any():
+            i = np.flatnonzero(outside)[0]
+            raise ValueError(f"{n[i]} business days from {np.asarray(keys)[i]} is outside the table")
+        if len(self.business_positions) == 0:
+            return self.keys[pos]
+        target = self.business_positions[np.clip(rank - 1, 0, len(self.business_positions) - 1)]
+        return np.where(n == 0, self.keys[pos], self.keys[target])
+
+    def _positions(self, keys):
+        pos = self.index.positions(keys)
+        if (pos < 0).any():
+            raise KeyError(np.asarray(keys)[pos < 0][0])
+        return pos
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def smallest_int_type(values):
+    """
+    Takes an integer array and returns the smallest numpy int type that holds all of its values.
+    """
+    if len(values) == 0:
+        return INT_TYPES[0]
+    low, high = int(values.min()), int(values.max())
+    for int_type in INT_TYPES:
+        if np.iinfo(int_type).min <= low and high <= np.iinfo(int_type).max:
+            return int_type
+    return np.int64
+
+
+def compact_array(values):
+    """
+    Takes a column array and returns it in a compact in-memory form: ints downcast to the smallest int type
+    that holds them, bools as bool and repeating strings as a pandas Categorical.  Anything else is unchanged.
+    """
+    values = np.asarray(values)
+    if values.dtype == bool:
+        return values
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(smallest_int_type(values))
+    if values.dtype == object:
+        codes, uniques = pd.factorize(values)
+        if len(uniques) * 2 <= len(values):
+            return pd.Categorical.from_codes(codes, uniques)
+    return values
+
+
+def compact_dataframe(columns, names):
+    """
+    Takes a dict of column name -> array and the column order and returns a DataFrame of the compacted columns.
+    """
+    return pd.DataFrame({name: compact_array(columns[name]) for name in names}, columns=names)
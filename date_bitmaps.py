@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from date_lookup import DateLookup
+
+# columns with more distinct values than this get no bitmaps unless they are asked for
+MAX_VALUES = 64
+
+
+class DateBitmaps:
+    """
+    Bitmap indexes over a date dimension table, one bit per row of its dense day index.  Every value of
+    the indexed columns has a packed bitmap of the rows holding it, so predicates are answered by and-ing,
+    or-ing and inverting bitmaps instead of filtering the table:
+
+        bitmaps = DateBitmaps(table)
+        bitmaps.keys(bitmaps.query(quarter=4, is_weekend=True))
+        bitmaps.keys(bitmaps.match("holiday_name", "Black Friday") | bitmaps.match("is_last_day_in_month"))
+    """
+
+    def __init__(self, table, columns=None, max_values=MAX_VALUES):
+        self.index = DateLookup(table[["date_key"]])
+        self.keys_array = self.index.keys
+        self.rows = len(self.keys_array)
+        self.all = _read_only(np.packbits(np.ones(self.rows, dtype=bool)))
+        self.none = _read_only(np.zeros_like(self.all))
+
+        if columns is None:
+            columns = [c for c in table.columns if c != "date_key" and table[c].nunique() <= max_values]
+        self.bitmaps = {}
+        for name in columns:
+            codes, uniques = pd.factorize(table[name].to_numpy())
+            self.bitmaps[name] = {
+                _value(value): _read_only(np.packbits(codes == i)) for i, value in enumerate(uniques.tolist())
+            }
+
+    def __len__(self):
+        return self.rows
+
+    def match(self, column, value=True):
+        """
+        Takes a column name and a value (True by default, for the flag columns) or a list of values and returns
+        the bitmap of the rows where the column holds it, as a new array the caller may modify.
+        Raises KeyError if the column has no bitmaps.
+        """
+        values = self.bitmaps[column]
+        if isinstance(value, (list, tuple, set, frozenset)):
+            bitmap = self.none.copy()
+            for v in value:
+                bitmap |= values.get(_value(v), self.none)
+            return bitmap
+        return values.get(_value(value), self.none).copy()
+
+    def query(self, **conditions):
+        """
+        Takes column=value conditions (a list of values matches any of them) and returns the bitmap of the
+        rows meeting all of them, e.g. query(quarter=4, is_weekend=True).
+        """
+        bitmap = self.all.copy()
+        for column, value in conditions.items():
+            bitmap &= self.match(column, value)
+        return bitmap
+
+    def date_range(self, first, last):
+        """
+        Takes the first and last date_key of a range (inclusive) and returns the bitmap of its rows.
+        Raises KeyError if either is not in the table.
+        """
+        bits = np.zeros(self.rows, dtype=bool)
+        bits[self.index.position(first) : self.index.position(last) + 1] = True
+        return np.packbits(bits)
+
+    def negate(self, bitmap):
+        """
+        Takes a bitmap and returns the bitmap of the other rows.
+        """
+        return ~bitmap & self.all
+
+    def count(self, bitmap):
+        """
+        Takes a bitmap and returns the number of rows in it.
+        """
+        return int(np.unpackbits(bitmap, count=self.rows).sum())
+
+    def keys(self, bitmap):
+        """
+        Takes a bitmap and returns the date_keys of its rows as a sorted int64 array.
+        """
+        return self.keys_array[np.flatnonzero(np.unpackbits(bitmap, count=self.rows))]
+
+
+def _read_only(bitmap):
+    # the stored bitmaps are shared by every query, so in-place operations on them must fail
+    bitmap.flags.writeable = False
+    return bitmap
+
+
+def _value(value):
+    # numpy scalars and python values of the same value share a bitmap
+    return value.item() if isinstance(value, np.generic) else value
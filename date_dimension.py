@@ -1,10 +1,20 @@
+"""
+Date dimension table and its scalar column functions.  numpy, pandas and holidays are imported inside the
+functions that need them, so the scalar calendar functions run on the standard library alone.
+"""
+from bisect import bisect_right
+from collections import namedtuple
 from datetime import timedelta, date
+from functools import lru_cache
 import calendar
-import isoweek
-import pandas as pd
-import holidays
+import os
+from key_codec import encode_date, decode_date, encode_date_array, days_to_keys, keys_to_days
+from enrichment import enrich_keys
 
 # global variables
+EPOCH = date(2000, 1, 1)
+START_DATE = date(2000, 1, 1)
+END_DATE = date(2050, 12, 31)
 DAYS_PER_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
 DAYS_OF_WEEK = [
     0,
@@ -39,12 +49,130 @@ SUPPORTED_HOLIDAYS = [
     "New Year's Day",
     "Cyber Monday",
 ]
+# names newer releases of the holidays package give the supported holidays
+HOLIDAY_ALIASES = {"Thanksgiving Day": "Thanksgiving"}
+COLUMNS = [
+    "date_key",
+    "full_date",
+    "day",
+    "day_of_week",
+    "day_of_quarter",
+    "day_of_year_half",
+    "day_of_year",
+    "day_num_overall",
+    "is_last_day_in_month",
+    "is_weekend",
+    "week",
+    "weekday_name",
+    "weekday_abbrev",
+    "week_of_month",
+    "week_num_overall",
+    "week_begin_date",
+    "week_begin_date_key",
+    "month",
+    "month_name",
+    "month_abbrev",
+    "month_of_quarter",
+    "month_num_overall",
+    "quarter",
+    "quarter_name",
+    "quarter_abbrev",
+    "quarter_num_overall",
+    "year_half",
+    "year_half_name",
+    "year_half_abbrev",
+    "year_half_num_overall",
+    "year",
+    "year_month",
+    "year_month_full",
+    "is_leap_year",
+    "is_peak_week",
+    "is_holiday",
+    "holiday_name",
+]
+OVERALL_COLUMNS = [
+    "day_num_overall",
+    "week_num_overall",
+    "month_num_overall",
+    "quarter_num_overall",
+    "year_half_num_overall",
+]
+# columns each column is calculated from when the table is built
+COLUMN_DEPENDENCIES = {
+    "date_key": ["year", "month", "day"],
+    "full_date": [],
+    "day": [],
+    "day_of_week": [],
+    "day_of_quarter": [],
+    "day_of_year_half": ["month", "day", "is_leap_year"],
+    "day_of_year": [],
+    "day_num_overall": [],
+    "is_last_day_in_month": [],
+    "is_weekend": ["day_of_week"],
+    "week": ["day_of_week"],
+    "weekday_name": ["day_of_week"],
+    "weekday_abbrev": ["weekday_name"],
+    "week_of_month": [],
+    "week_num_overall": ["year", "week"],
+    "week_begin_date": ["day_of_week"],
+    "week_begin_date_key": ["day_of_week"],
+    "month": [],
+    "month_name": ["month"],
+    "month_abbrev": ["month_name"],
+    "month_of_quarter": ["month"],
+    "month_num_overall": ["year", "month"],
+    "quarter": ["month"],
+    "quarter_name": ["quarter"],
+    "quarter_abbrev": ["quarter"],
+    "quarter_num_overall": ["year", "quarter"],
+    "year_half": ["month"],
+    "year_half_name": ["year", "year_half"],
+    "year_half_abbrev": ["year_half"],
+    "year_half_num_overall": ["year", "year_half"],
+    "year": [],
+    "year_month": ["year", "month"],
+    "year_month_full": ["full_date"],
+    "is_leap_year": ["year"],
+    "is_peak_week": ["date_key"],
+    "is_holiday": ["date_key"],
+    "holiday_name": ["date_key"],
+}
+# retail fiscal calendar: the year ends on the week_end day (1 Monday .. 7 Sunday) nearest to ("nearest") or last
+# on or before ("last") the end of end_month, and each quarter has periods of pattern weeks.  The 53rd week of a
+# long year goes to the last period.  Years are named after the calendar year holding most of their months.
+FiscalCalendar = namedtuple("FiscalCalendar", ["end_month", "week_end", "pattern", "end_rule"])
+RETAIL_CALENDAR = FiscalCalendar(end_month=1, week_end=6, pattern=(4, 4, 5), end_rule="nearest")
+FISCAL_COLUMNS = [
+    "fiscal_year",
+    "fiscal_quarter",
+    "fiscal_period",
+    "fiscal_week",
+    "fiscal_week_of_period",
+    "fiscal_day_of_year",
+    "fiscal_week_num_overall",
+    "fiscal_period_num_overall",
+    "fiscal_quarter_num_overall",
+]
+# set by profiling.profile_columns() to time each column block of calculate_column_arrays()
+COLUMN_TIMER = None
 
 
-def calculate_columns(date_key):
+def calculate_columns(date_key, epoch=EPOCH, columns=None):
     """
-    Takes a date_key int(YYYMMDD) and returns a tuple with the different column values.
+    Takes a date_key int(YYYMMDD) and returns a tuple with the different column values, or only the
+    requested ones in the order given.  The *_num_overall columns are counted from epoch.
     """
+    if columns is not None:
+        resolve_columns(columns)
+        values = []
+        for c in columns:
+            if c == "date_key":
+                values.append(date_key)
+            elif c in OVERALL_COLUMNS:
+                values.append(COLUMN_FUNCTIONS[c](date_key, epoch))
+            else:
+                values.append(COLUMN_FUNCTIONS[c](date_key))
+        return tuple(values)
 
     return (
         date_key,
@@ -54,29 +182,29 @@ def calculate_columns(date_key):
         day_of_quarter(date_key),
         day_of_year_half(date_key),
         day_of_year(date_key),
-        day_num_overall(date_key),
+        day_num_overall(date_key, epoch),
         is_last_day_in_month(date_key),
         is_weekend(date_key),
         week(date_key),
         weekday_name(date_key),
         weekday_abbrev(date_key),
         week_of_month(date_key),
-        week_num_overall(date_key),
+        week_num_overall(date_key, epoch),
         week_begin_date(date_key),
         week_begin_date_key(date_key),
         month(date_key),
         month_name(date_key),
         month_abbrev(date_key),
         month_of_quarter(date_key),
-        month_num_overall(date_key),
+        month_num_overall(date_key, epoch),
         quarter(date_key),
         quarter_name(date_key),
         quarter_abbrev(date_key),
-        quarter_num_overall(date_key),
+        quarter_num_overall(date_key, epoch),
         year_half(date_key),
         year_half_name(date_key),
         year_half_abbrev(date_key),
-        year_half_num_overall(date_key),
+        year_half_num_overall(date_key, epoch),
         year(date_key),
         year_month(date_key),
         year_month_full(date_key),
@@ -91,20 +219,14 @@ def date_to_key(kdate):
     """
     Takes a datetime.date and returns the date_key format: int(YYYYMMDD)
     """
-    month_zero = ""
-    day_zero = ""
-    if kdate.month < 10:
-        month_zero = "0"
-    if kdate.day < 10:
-        day_zero = "0"
-    return int(f"{kdate.year}{month_zero}{kdate.month}{day_zero}{kdate.day}")
+    return encode_date(kdate.year, kdate.month, kdate.day)
 
 
 def key_to_date(k):
     """
     Takes a date_key and returns a datetime.date
     """
-    y, m, d = ymd_int(k)
+    y, m, d = decode_date(k)
     return date(y, m, d)
 
 
@@ -112,22 +234,15 @@ def ymd_str(k):
     """
     Takes date_key d in YYYYMMDD format and returns the year, month and day as strings.
     """
-    dstring = str(k)
-    year = dstring[:4]
-    month = dstring[4:6]
-    day = dstring[6:]
-    return year, month, day
+    year, month, day = decode_date(k)
+    return f"{year:04d}", f"{month:02d}", f"{day:02d}"
 
 
 def ymd_int(k):
     """
     Takes date_key d in YYYYMMDD format and returns the year, month and day as integers.
     """
-    dstring = str(k)
-    year = int(dstring[:4])
-    month = int(dstring[4:6])
-    day = int(dstring[6:])
-    return year, month, day
+    return decode_date(k)
 
 
 def full_date(k):
@@ -228,22 +343,11 @@ def day_of_year(k):
     return doy + day
 
 
-def day_num_overall(k):
+def day_num_overall(k, epoch=EPOCH):
     """
-    Sequential number from 01/01/2000 | Dataype: int | Format 1.. (2138)
+    Sequential number from the epoch (Default: 01/01/2000) | Dataype: int | Format 1.. (2138)
     """
-    dno = 0
-    y = year(k)
-    num_years = y - 2000
-    for i in range(num_years):
-        cyear = y - (num_years - i)
-        if is_leap_year(cyear):
-            dno += 366
-        else:
-            dno += 365
-
-    dno += day_of_year(k)
-    return dno
+    return (key_to_date(k) - epoch).days + 1
 
 
 def is_last_day_in_month(k):
@@ -291,10 +395,7 @@ def week_of_month(k):
     Week number in the month | Datatype: int | Format: 1..5 (1)
     """
     year, m, d = ymd_int(k)
-    month_zero = ""
-    if m < 10:
-        month_zero = "0"
-    first_day_of_month = int(f"{year}{month_zero}{m}01")
+    first_day_of_month = encode_date(year, m, 1)
 
     # if it is the first day of the month, we know it is week 1.
     if k == first_day_of_month:
@@ -332,22 +433,35 @@ def week_of_month(k):
         raise Exception(f"Something went wrong in week_of_month({k})")
 
 
-def week_num_overall(k):
+def week_num_overall(k, epoch=EPOCH):
     """
-    Week number from 01/01/2000 | Datatype: int | Format: 1.. (120)
+    Week number from the epoch (Default: 01/01/2000) | Datatype: int | Format: 1.. (120)
     """
-    wno = 0
-    y = year(k)
-    m = month(k)
-    d = day(k)
-    if y == 2000 and m == 1 and (d == 1 or d == 2):
+    cur = key_to_date(k)
+    first_monday, start, offset = _week_num_anchor(epoch)
+    if epoch <= cur < first_monday:
         return 1
-    num_years = y - 2000
-    for i in range(num_years):
-        cyear = y - (num_years - i)
-        wno += isoweek.Week.last_week_of_year(cyear).week
-    wno += week(k)
-    return wno + 1
+
+    # weeks are counted by the iso week of the date within its calendar year
+    return (_iso_year_start(cur.year) - start).days // 7 + week(k) + offset
+
+
+def _iso_year_start(y):
+    """
+    Takes a year and returns the datetime.date of the Monday of its first iso week.
+    """
+    jan_4 = date(y, 1, 4)
+    return jan_4 - timedelta(days=jan_4.weekday())
+
+
+def _week_num_anchor(epoch):
+    """
+    Takes the epoch and returns the first Monday on or after it, the start of the iso year that
+    week_num_overall() counts from, and the offset to add to the counted weeks.
+    """
+    first_monday = epoch + timedelta(days=-epoch.weekday() % 7)
+    offset = 1 if first_monday == epoch else 2
+    return first_monday, _iso_year_start(first_monday.year), offset - first_monday.isocalendar().week
 
 
 def week_begin_date(k):
@@ -362,17 +476,11 @@ def week_begin_date_key(k):
     Key for the first day of the week | Dataype: int | Format: YYYYMMDD (20011226)
     """
     dow = day_of_week(k)
-    month_zero = ""
-    day_zero = ""
     if dow == 1:
         return k
     else:
         wbd = key_to_date(k) - timedelta(days=(dow - 1))
-        if wbd.month < 10:
-            month_zero = "0"
-        if wbd.day < 10:
-            day_zero = "0"
-        return int(f"{wbd.year}{month_zero}{wbd.month}{day_zero}{wbd.day}")
+        return date_to_key(wbd)
 
 
 def month(k):
@@ -409,17 +517,11 @@ def month_of_quarter(k):
     return moq
 
 
-def month_num_overall(k):
+def month_num_overall(k, epoch=EPOCH):
     """
-    Month number from 01/01/2000 | Datatype: int | Format: 1.. (47)
+    Month number from the epoch (Default: 01/01/2000) | Datatype: int | Format: 1.. (47)
     """
-    mno = 0
-    y = year(k)
-    num_years = y - 2000
-    for i in range(num_years):
-        mno += 12
-    mno += month(k)
-    return mno
+    return (year(k) - epoch.year) * 12 + month(k) - epoch.month + 1
 
 
 def quarter(k):
@@ -444,17 +546,12 @@ def quarter_abbrev(k):
     return f"Q{quarter(k)}"
 
 
-def quarter_num_overall(k):
+def quarter_num_overall(k, epoch=EPOCH):
     """
-    Quarter number from 01/01/2000 | Datatype: int | Format: 1.. (20)
+    Quarter number from the epoch (Default: 01/01/2000) | Datatype: int | Format: 1.. (20)
     """
-    qno = 0
-    y = year(k)
-    num_years = y - 2000
-    for i in range(num_years):
-        qno += 4
-    qno += quarter(k)
-    return qno
+    epoch_quarter = (epoch.month - 1) // 3 + 1
+    return (year(k) - epoch.year) * 4 + quarter(k) - epoch_quarter + 1
 
 
 def year_half(k):
@@ -484,17 +581,12 @@ def year_half_abbrev(k):
     return f"H{year_half(k)}"
 
 
-def year_half_num_overall(k):
+def year_half_num_overall(k, epoch=EPOCH):
     """
-    Year half number from 01/01/2000 | Datatype: int | Format: 1.. (7)
+    Year half number from the epoch (Default: 01/01/2000) | Datatype: int | Format: 1.. (7)
     """
-    yhno = 0
-    y = year(k)
-    num_years = y - 2000
-    for i in range(num_years):
-        yhno += 2
-    yhno += year_half(k)
-    return yhno
+    epoch_half = 1 if epoch.month < 7 else 2
+    return (year(k) - epoch.year) * 2 + year_half(k) - epoch_half + 1
 
 
 def year(k):
@@ -510,10 +602,7 @@ def year_month(k):
     Date format in YYYYMM | Datatype: int | Format: 200001..205012 (202301)
     """
     year, month, _ = ymd_int(k)
-    month_zero = ""
-    if month < 10:
-        month_zero = "0"
-    return int(f"{year}{month_zero}{month}")
+    return year * 100 + month
 
 
 def year_month_full(k):
@@ -532,7 +621,7 @@ def is_leap_year(k):
     """
     Boolean for leap year | Datatype: bool | Format: True..False (False)
     """
-    if len(str(k)) == 4:
+    if k < 10000:
         return calendar.isleap(k)
     y = year(k)
     return calendar.isleap(y)
@@ -542,135 +631,716 @@ def is_peak_week(k):
     """
     Boolean to flag peak week (Tue prior to Black Friday through to Cyber Monday) | Datatype: bool | Format: True..False (False)
     """
-    cur = key_to_date(k)
+    return k in peak_week_index(year(k))
 
-    # check if it is Black Friday, Cyber Monday, or Thanksgiving.  If so, it is peak week.
-    h = holiday_name(k)
-    if h == "Black Friday" or h == "Cyber Monday" or h == "Thanksgiving":
-        return True
-
-    # check if black friday is within 7 days of d, if not, we know it is not peak week
-    seven_range = []
-    for i in range(7):
-        seven_range.append(date_to_key(cur - timedelta(days=i + 1)))
-        seven_range.append(date_to_key(cur + timedelta(days=i + 1)))
-    which = ""
-    found = False
-    for i, w in enumerate(seven_range):
-        if is_holiday(w) and holiday_name(w) == "Black Friday":
-            found = True
-            which = w
-    if not found:
-        return False
-
-    # if we're here, we have found Black Friday.  Determine peak week days from there.
-    begin = key_to_date(which) - timedelta(days=3)
-    end = key_to_date(which) + timedelta(days=3)
-    if found:
-        if cur >= begin and cur <= end:
-            return True
-    return False
 
+@lru_cache(maxsize=None)
+def holiday_index(y):
+    """
+    Takes a year and returns a dict of date_key -> holiday name for the supported holidays in that year.
+    Black Friday and Cyber Monday are derived from Thanksgiving.  Built once per year and cached.
+    """
+    import holidays
 
-def is_holiday(k):
-    cur = key_to_date(k)
-    h = holidays.US()
-    holiday = h.get(cur)
-    if holiday in SUPPORTED_HOLIDAYS:
-        return True
+    index = {}
+    h = holidays.US(years=y)
+    for hdate, name in h.items():
+        name = HOLIDAY_ALIASES.get(name, name)
+        if name in SUPPORTED_HOLIDAYS:
+            index[date_to_key(hdate)] = name
+        if name == "Thanksgiving":
+            # black friday is the day after thanksgiving, cyber monday the monday after
+            for offset, derived in ((1, "Black Friday"), (4, "Cyber Monday")):
+                cur = hdate + timedelta(days=offset)
+                index[date_to_key(cur)] = h.get(cur) or derived
+
+    return index
+
+
+def holiday_arrays(keys):
+    """
+    Takes an array of date_keys and returns the is_holiday and holiday_name columns as arrays.
+    """
+    return _index_arrays(keys, holiday_index)
+
+
+def _index_arrays(keys, year_index):
+    """
+    Takes an array of date_keys and a function of year -> dict of date_key -> holiday name and returns the
+    holiday flags and names of the keys as arrays.
+    """
+    import numpy as np
+
+    keys = np.asarray(keys, dtype=np.int64)
+    flags = np.zeros(len(keys), dtype=bool)
+    names = np.full(len(keys), "Not Applicable", dtype=object)
+
+    index = {}
+    for y in np.unique(keys // 10000).tolist():
+        index.update(year_index(y))
+    if not index:
+        return flags, names
+    holiday_keys = np.array(sorted(index), dtype=np.int64)
+    holiday_names = np.array([index[k] for k in holiday_keys.tolist()], dtype=object)
+
+    pos = np.minimum(np.searchsorted(holiday_keys, keys), len(holiday_keys) - 1)
+    flags = holiday_keys[pos] == keys
+    names[flags] = holiday_names[pos[flags]]
+    return flags, names
+
+
+@lru_cache(maxsize=None)
+def peak_week_index(y):
+    """
+    Takes a year and returns the frozenset of date_keys in its peak week, Tuesday before Black Friday through
+    Cyber Monday.  Built once per year from holiday_index() and cached.
+    """
+    peak = set()
+    for k, name in holiday_index(y).items():
+        if name == "Black Friday":
+            black_friday = key_to_date(k)
+            for offset in range(-3, 4):
+                peak.add(date_to_key(black_friday + timedelta(days=offset)))
+        elif name in ("Thanksgiving", "Cyber Monday"):
+            peak.add(k)
+
+    return frozenset(peak)
+
+
+def peak_week_array(keys):
+    """
+    Takes an array of date_keys and returns the is_peak_week column as a bool array.
+    """
+    import numpy as np
+
+    keys = np.asarray(keys, dtype=np.int64)
+    peak = set()
+    for y in np.unique(keys // 10000).tolist():
+        peak.update(peak_week_index(y))
+    return np.isin(keys, np.fromiter(peak, np.int64, len(peak)))
 
-    # check if black friday (day after thanksgiving)
-    cur -= timedelta(days=1)
-    if h.get(cur) == "Thanksgiving":
-        return True
-    # check if cyber monday (monday after thanksgiving)
-    cur -= timedelta(days=3)
-    if h.get(cur) == "Thanksgiving":
-        return True
 
-    return False
+def is_holiday(k):
+    """
+    Boolean to flag the supported holidays | Datatype: bool | Format: True..False (False)
+    """
+    return k in holiday_index(year(k))
 
 
 def holiday_name(k):
-    if is_holiday(k):
-        holiday = holidays.US().get(key_to_date(k))
-        if not holiday:
-            cur = key_to_date(k)
-            # check if black friday (day after thanksgiving)
-            cur -= timedelta(days=1)
-            if holiday_name(date_to_key(cur)) == "Thanksgiving":
-                return "Black Friday"
-            # check if cyber monday (monday after thanksgiving)
-            cur -= timedelta(days=3)
-            if holiday_name(date_to_key(cur)) == "Thanksgiving":
-                return "Cyber Monday"
-            # check if Christmas Eve (day before Christmas)
-            cur = key_to_date(k)
-            cur += timedelta(days=1)
-            if holiday_name(date_to_key(cur)) == "Christmas Day":
-                return "Christmas Eve"
-
-            return "Not Applicable"
-        else:
-            return holiday
-    else:
-        return "Not Applicable"
-
-
-def create_dataframe():
-    columns = [
-        "date_key",
-        "full_date",
-        "day",
-        "day_of_week",
-        "day_of_quarter",
-        "day_of_year_half",
-        "day_of_year",
-        "day_num_overall",
-        "is_last_day_in_month",
-        "is_weekend",
-        "week",
-        "weekday_name",
-        "weekday_abbrev",
-        "week_of_month",
-        "week_num_overall",
-        "week_begin_date",
-        "week_begin_date_key",
-        "month",
-        "month_name",
-        "month_abbrev",
-        "month_of_quarter",
-        "month_num_overall",
-        "quarter",
-        "quarter_name",
-        "quarter_abbrev",
-        "quarter_num_overall",
-        "year_half",
-        "year_half_name",
-        "year_half_abbrev",
-        "year_half_num_overall",
-        "year",
-        "year_month",
-        "year_month_full",
-        "is_leap_year",
-        "is_peak_week",
-        "is_holiday",
-        "holiday_name",
-    ]
-    data = []
-    cur = key_to_date(20000101)
-    while True:
-        if cur.year == 2051:
+    """
+    Name of the supported holiday | Datatype: str | Format: SUPPORTED_HOLIDAYS..Not Applicable (Christmas Day)
+    """
+    return holiday_index(year(k)).get(k, "Not Applicable")
+
+
+def holiday_calendar(cal):
+    """
+    Takes a holiday calendar as a country code ("US") or a (country, subdivision) pair (("CA", "ON")) and
+    returns it as a (country, subdivision) tuple, subdivision None for the national calendar.
+    """
+    if isinstance(cal, str):
+        return cal, None
+    country, subdivision = cal
+    return country, subdivision
+
+
+def calendar_tag(cal):
+    """
+    Takes a holiday calendar and returns the suffix of its column names, e.g. "us" or "ca_on".
+    """
+    country, subdivision = holiday_calendar(cal)
+    tag = country if subdivision is None else f"{country}_{subdivision}"
+    return tag.lower().replace("-", "_")
+
+
+def calendar_columns(calendars):
+    """
+    Takes a list of holiday calendars and returns the names of their columns: is_holiday_<tag> and
+    holiday_name_<tag> for each calendar followed by holiday_mask.
+    """
+    columns = []
+    for cal in calendars:
+        tag = calendar_tag(cal)
+        columns += [f"is_holiday_{tag}", f"holiday_name_{tag}"]
+    return columns + ["holiday_mask"]
+
+
+def all_columns(calendars=None, fiscal=None):
+    """
+    Takes a list of holiday calendars and a FiscalCalendar (or None for either) and returns COLUMNS followed by
+    the calendar_columns() and the FISCAL_COLUMNS when given.
+    """
+    columns = list(COLUMNS)
+    if calendars:
+        columns += calendar_columns(calendars)
+    if fiscal is not None:
+        columns += FISCAL_COLUMNS
+    return columns
+
+
+@lru_cache(maxsize=None)
+def calendar_index(country, subdivision, y):
+    """
+    Takes a country code, a subdivision code (or None) and a year and returns a dict of date_key -> holiday name
+    for every holiday of that calendar in that year.  Built once per calendar and year and cached.
+    """
+    import holidays
+
+    try:
+        h = holidays.country_holidays(country, subdiv=subdivision, years=y)
+    except NotImplementedError as e:
+        raise ValueError(f"Unknown holiday calendar: {country} {subdivision or ''}".rstrip()) from e
+    return {date_to_key(hdate): name for hdate, name in h.items()}
+
+
+def calendar_arrays(keys, cal):
+    """
+    Takes an array of date_keys and a holiday calendar and returns its holiday flags and names as arrays.
+    """
+    country, subdivision = holiday_calendar(cal)
+    return _index_arrays(keys, lambda y: calendar_index(country, subdivision, y))
+
+
+def is_calendar_holiday(k, cal):
+    """
+    Takes a date_key and a holiday calendar and returns True if the date is one of its holidays.
+    """
+    country, subdivision = holiday_calendar(cal)
+    return k in calendar_index(country, subdivision, year(k))
+
+
+def calendar_holiday_name(k, cal):
+    """
+    Takes a date_key and a holiday calendar and returns the name of its holiday on that date, or Not Applicable.
+    """
+    country, subdivision = holiday_calendar(cal)
+    return calendar_index(country, subdivision, year(k)).get(k, "Not Applicable")
+
+
+def fiscal_calendar(fiscal):
+    """
+    Takes a FiscalCalendar (or a tuple of its fields) and returns it validated, with its pattern as a tuple.
+    """
+    fiscal = FiscalCalendar(*fiscal)
+    pattern = tuple(int(w) for w in fiscal.pattern)
+    if not 1 <= fiscal.end_month <= 12:
+        raise ValueError(f"Invalid fiscal year end month: {fiscal.end_month}")
+    if not 1 <= fiscal.week_end <= 7:
+        raise ValueError(f"Invalid fiscal week end day: {fiscal.week_end}")
+    if len(pattern) != 3 or min(pattern) < 1 or sum(pattern) != 13:
+        raise ValueError(f"A fiscal pattern needs three periods totalling 13 weeks, got {fiscal.pattern}")
+    if fiscal.end_rule not in ("nearest", "last"):
+        raise ValueError(f"Invalid fiscal year end rule: {fiscal.end_rule}")
+    return fiscal._replace(pattern=pattern)
+
+
+def fiscal_year_end(y, fiscal=RETAIL_CALENDAR):
+    """
+    Takes a fiscal year and returns the datetime.date of its last day.
+    """
+    fiscal = fiscal_calendar(fiscal)
+    end_year = y if fiscal.end_month >= 6 else y + 1
+    month_end = date(end_year, fiscal.end_month, calendar.monthrange(end_year, fiscal.end_month)[1])
+    behind = (month_end.isoweekday() - fiscal.week_end) % 7
+    if fiscal.end_rule == "nearest" and behind > 3:
+        return month_end + timedelta(days=7 - behind)
+    return month_end - timedelta(days=behind)
+
+
+def fiscal_periods(y, fiscal=RETAIL_CALENDAR):
+    """
+    Takes a fiscal year and returns its period boundary table: a tuple of the datetime.date each of its 12 periods
+    starts on, followed by the start of the next year.  Built once per year and calendar and cached.
+    """
+    return _fiscal_periods(y, fiscal_calendar(fiscal))
+
+
+@lru_cache(maxsize=None)
+def _fiscal_periods(y, fiscal):
+    start = fiscal_year_end(y - 1, fiscal) + timedelta(days=1)
+    boundaries = [start]
+    for weeks in fiscal.pattern * 4:
+        boundaries.append(boundaries[-1] + timedelta(weeks=weeks))
+    # a 53 week year ends a week after the 12 periods, its last period takes the extra week
+    boundaries[-1] = fiscal_year_end(y, fiscal) + timedelta(days=1)
+    return tuple(boundaries)
+
+
+def fiscal_position(k, fiscal=RETAIL_CALENDAR):
+    """
+    Takes a date_key and returns (fiscal year, fiscal period, first date of the period, first date of the year).
+    """
+    d = key_to_date(k)
+    y = d.year
+    for fy in (y - 1, y, y + 1):
+        boundaries = fiscal_periods(fy, fiscal)
+        if boundaries[0] <= d < boundaries[-1]:
+            period = bisect_right(boundaries, d)
+            return fy, period, boundaries[period - 1], boundaries[0]
+    raise ValueError(f"{k} is outside the fiscal years around it")
+
+
+def fiscal_year(k, fiscal=RETAIL_CALENDAR):
+    """
+    Fiscal year, named after the calendar year holding most of it | Datatype: int | Format: YYYY (2023)
+    """
+    return fiscal_position(k, fiscal)[0]
+
+
+def fiscal_quarter(k, fiscal=RETAIL_CALENDAR):
+    """
+    Fiscal quarter | Datatype: int | Format: 1..4 (4)
+    """
+    return (fiscal_position(k, fiscal)[1] - 1) // 3 + 1
+
+
+def fiscal_period(k, fiscal=RETAIL_CALENDAR):
+    """
+    Fiscal period (month) of the fiscal year | Datatype: int | Format: 1..12 (10)
+    """
+    return fiscal_position(k, fiscal)[1]
+
+
+def fiscal_week(k, fiscal=RETAIL_CALENDAR):
+    """
+    Week of the fiscal year | Datatype: int | Format: 1..53 (43)
+    """
+    _, _, _, year_start = fiscal_position(k, fiscal)
+    return (key_to_date(k) - year_start).days // 7 + 1
+
+
+def fiscal_week_of_period(k, fiscal=RETAIL_CALENDAR):
+    """
+    Week of the fiscal period | Datatype: int | Format: 1..6 (4)
+    """
+    _, _, period_start, _ = fiscal_position(k, fiscal)
+    return (key_to_date(k) - period_start).days // 7 + 1
+
+
+def fiscal_day_of_year(k, fiscal=RETAIL_CALENDAR):
+    """
+    Day of the fiscal year | Datatype: int | Format: 1..371 (300)
+    """
+    _, _, _, year_start = fiscal_position(k, fiscal)
+    return (key_to_date(k) - year_start).days + 1
+
+
+def fiscal_week_num_overall(k, epoch=EPOCH, fiscal=RETAIL_CALENDAR):
+    """
+    Fiscal week number counted from the fiscal week of epoch | Datatype: int | Format: 1..N (1243)
+    """
+    epoch_week = _fiscal_week_start(date_to_key(epoch), fiscal)
+    return (_fiscal_week_start(k, fiscal) - epoch_week).days // 7 + 1
+
+
+def _fiscal_week_start(k, fiscal):
+    _, _, _, year_start = fiscal_position(k, fiscal)
+    d = key_to_date(k)
+    return d - timedelta(days=(d - year_start).days % 7)
+
+
+def fiscal_period_num_overall(k, epoch=EPOCH, fiscal=RETAIL_CALENDAR):
+    """
+    Fiscal period number counted from the fiscal period of epoch | Datatype: int | Format: 1..N (286)
+    """
+    fy, period, _, _ = fiscal_position(k, fiscal)
+    epoch_fy, epoch_period, _, _ = fiscal_position(date_to_key(epoch), fiscal)
+    return (fy - epoch_fy) * 12 + period - epoch_period + 1
+
+
+def fiscal_quarter_num_overall(k, epoch=EPOCH, fiscal=RETAIL_CALENDAR):
+    """
+    Fiscal quarter number counted from the fiscal quarter of epoch | Datatype: int | Format: 1..N (96)
+    """
+    fy, period, _, _ = fiscal_position(k, fiscal)
+    epoch_fy, epoch_period, _, _ = fiscal_position(date_to_key(epoch), fiscal)
+    return (fy - epoch_fy) * 4 + (period - 1) // 3 - (epoch_period - 1) // 3 + 1
+
+
+def fiscal_arrays(days, fiscal=RETAIL_CALENDAR, epoch=EPOCH):
+    """
+    Takes a numpy datetime64[D] array and returns a dict of FISCAL_COLUMNS -> array with the values of the scalar
+    fiscal functions.  The fiscal_periods() tables of the years covered are laid out as one array of period starts,
+    spread to a period number per day, so each row is a direct index.
+    """
+    import numpy as np
+
+    days = np.asarray(days, dtype="datetime64[D]").astype(np.int64)
+    epoch_fy, epoch_period, _, _ = fiscal_position(date_to_key(epoch), fiscal)
+    epoch_week = np.datetime64(_fiscal_week_start(date_to_key(epoch), fiscal), "D").astype(np.int64)
+    if len(days) == 0:
+        return {c: np.zeros(0, dtype=np.int64) for c in FISCAL_COLUMNS}
+
+    first_year = int(days.min().astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64)) + 1970 - 1
+    last_year = int(days.max().astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64)) + 1970 + 1
+    years = np.arange(first_year, last_year + 1)
+    boundaries = [fiscal_periods(y, fiscal)[:12] for y in years.tolist()]
+    boundaries.append((fiscal_periods(last_year, fiscal)[12],))
+    starts = np.array([d for b in boundaries for d in b], dtype="datetime64[D]").astype(np.int64)
+
+    # period index (12 per fiscal year from first_year) of every day between the first and the last boundary
+    slots = np.repeat(np.arange(len(starts) - 1), np.diff(starts))
+    index = slots[days - starts[0]]
+    fy = years[index // 12]
+    period = index % 12 + 1
+    year_start = starts[index - index % 12]
+    quarter = (period - 1) // 3 + 1
+    week = (days - year_start) // 7 + 1
+
+    return {
+        "fiscal_year": fy,
+        "fiscal_quarter": quarter,
+        "fiscal_period": period,
+        "fiscal_week": week,
+        "fiscal_week_of_period": (days - starts[index]) // 7 + 1,
+        "fiscal_day_of_year": days - year_start + 1,
+        "fiscal_week_num_overall": (year_start + (week - 1) * 7 - epoch_week) // 7 + 1,
+        "fiscal_period_num_overall": (fy - epoch_fy) * 12 + period - epoch_period + 1,
+        "fiscal_quarter_num_overall": (fy - epoch_fy) * 4 + quarter - ((epoch_period - 1) // 3 + 1) + 1,
+    }
+
+
+def resolve_columns(columns):
+    """
+    Takes a list of column names and returns the set of those columns plus every column they depend on.
+    """
+    unknown = [c for c in columns if c not in COLUMN_DEPENDENCIES]
+    if unknown:
+        raise ValueError(f"Unknown date dimension columns: {unknown}")
+
+    needed = set()
+    pending = list(columns)
+    while pending:
+        c = pending.pop()
+        if c not in needed:
+            needed.add(c)
+            pending.extend(COLUMN_DEPENDENCIES[c])
+    return needed
+
+
+def calculate_column_arrays(days, epoch=EPOCH, columns=None, calendars=None, fiscal=None):
+    """
+    Takes a numpy datetime64[D] array and returns a dict of column name -> array with the
+    same values calculate_columns() produces for each day, computed for the whole range at once.
+    Only the requested columns (default: all) and the columns they depend on are calculated.
+    With calendars, the calendar_columns() of those holiday calendars are available too (and part of the default):
+    holiday_mask has bit i set on the holidays of the i-th calendar.
+    The FISCAL_COLUMNS of fiscal (default: RETAIL_CALENDAR) can be requested, and are part of the default when
+    fiscal is given.
+    """
+    import numpy as np
+
+    calendars = list(calendars or [])
+    if len(calendars) > 63:
+        raise ValueError("holiday_mask holds at most 63 calendars")
+    holiday_columns = calendar_columns(calendars) if calendars else []
+    if columns is None:
+        columns = all_columns(calendars, fiscal)
+    needed = resolve_columns([c for c in columns if c not in holiday_columns and c not in FISCAL_COLUMNS])
+    if any(c in holiday_columns for c in columns):
+        needed |= resolve_columns(["date_key"])
+    needed |= {c for c in columns if c in holiday_columns or c in FISCAL_COLUMNS}
+    if COLUMN_TIMER is not None:
+        needed = COLUMN_TIMER(needed)
+    days = np.asarray(days, dtype="datetime64[D]")
+    months = days.astype("datetime64[M]")
+    first_of_month = months.astype("datetime64[D]")
+    cols = {}
+
+    if "year" in needed:
+        cols["year"] = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    if "month" in needed:
+        cols["month"] = months.astype(np.int64) % 12 + 1
+    if "day" in needed:
+        cols["day"] = (days - first_of_month).astype(np.int64) + 1
+    if "date_key" in needed:
+        cols["date_key"] = encode_date_array(cols["year"], cols["month"], cols["day"])
+    if "full_date" in needed:
+        cols["full_date"] = np.datetime_as_string(days, unit="D").astype(object)
+    if "day_of_week" in needed:
+        # 1970-01-01 was a Thursday
+        cols["day_of_week"] = (days.astype(np.int64) + 3) % 7 + 1
+    if "is_leap_year" in needed:
+        y = cols["year"]
+        cols["is_leap_year"] = (y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))
+    if "day_of_quarter" in needed:
+        month_index = months.astype(np.int64)
+        quarter_start = (month_index - month_index % 3).astype("datetime64[M]")
+        cols["day_of_quarter"] = (days - quarter_start.astype("datetime64[D]")).astype(np.int64) + 1
+    if "day_of_year_half" in needed:
+        # same values as day_of_year_half(): the first half adds the leap day from January on,
+        # the second half restarts from the day of the month
+        m, d = cols["month"], cols["day"]
+        days_before_month = np.cumsum(DAYS_PER_MONTH)
+        cols["day_of_year_half"] = np.where(m < 7, days_before_month[m - 1] + cols["is_leap_year"] + d, d)
+    if "day_of_year" in needed:
+        cols["day_of_year"] = (days - days.astype("datetime64[Y]")).astype(np.int64) + 1
+    if "day_num_overall" in needed:
+        cols["day_num_overall"] = (days - np.datetime64(epoch, "D")).astype(np.int64) + 1
+    if "is_last_day_in_month" in needed:
+        cols["is_last_day_in_month"] = (days + 1).astype("datetime64[M]") != months
+    if "is_weekend" in needed:
+        cols["is_weekend"] = cols["day_of_week"] >= 6
+    if "week" in needed:
+        # ISO weeks are anchored on the Thursday of the week
+        thursday = days - cols["day_of_week"] + 4
+        iso_year = thursday.astype("datetime64[Y]")
+        cols["week"] = (thursday - iso_year.astype("datetime64[D]")).astype(np.int64) // 7 + 1
+    if "weekday_name" in needed:
+        cols["weekday_name"] = np.array(DAYS_OF_WEEK, dtype=object)[cols["day_of_week"]]
+    if "weekday_abbrev" in needed:
+        weekday_abbrevs = np.array([0] + [n[:3] for n in DAYS_OF_WEEK[1:]], dtype=object)
+        cols["weekday_abbrev"] = weekday_abbrevs[cols["day_of_week"]]
+    if "week_of_month" in needed:
+        first_monday = first_of_month - (first_of_month.astype(np.int64) + 3) % 7
+        cols["week_of_month"] = np.minimum((days - first_monday).astype(np.int64) // 7 + 1, 5)
+    if "week_num_overall" in needed:
+        # same count as week_num_overall(), from the iso year start of the date's calendar year
+        first_monday, start, offset = _week_num_anchor(epoch)
+        jan_4 = (cols["year"] - 1970).astype("datetime64[Y]").astype("datetime64[D]") + 3
+        iso_start = jan_4 - (jan_4.astype(np.int64) + 3) % 7
+        wno = (iso_start - np.datetime64(start, "D")).astype(np.int64) // 7 + cols["week"] + offset
+        wno[(days >= np.datetime64(epoch, "D")) & (days < np.datetime64(first_monday, "D"))] = 1
+        cols["week_num_overall"] = wno
+    if "week_begin_date" in needed or "week_begin_date_key" in needed:
+        monday = days - (cols["day_of_week"] - 1)
+        cols["week_begin_date"] = np.datetime_as_string(monday, unit="D").astype(object)
+        cols["week_begin_date_key"] = days_to_keys(monday)
+    if "month_name" in needed:
+        cols["month_name"] = np.array(NAME_OF_MONTH, dtype=object)[cols["month"]]
+    if "month_abbrev" in needed:
+        month_abbrevs = np.array([0] + [n[:3] for n in NAME_OF_MONTH[1:]], dtype=object)
+        cols["month_abbrev"] = month_abbrevs[cols["month"]]
+    if "month_of_quarter" in needed:
+        cols["month_of_quarter"] = (cols["month"] - 1) % 3 + 1
+    if "month_num_overall" in needed:
+        cols["month_num_overall"] = (cols["year"] - epoch.year) * 12 + cols["month"] - epoch.month + 1
+    if "quarter" in needed:
+        cols["quarter"] = (cols["month"] - 1) // 3 + 1
+    if "quarter_name" in needed:
+        quarter_names = np.array([0] + [f"Quarter {i}" for i in range(1, 5)], dtype=object)
+        cols["quarter_name"] = quarter_names[cols["quarter"]]
+    if "quarter_abbrev" in needed:
+        quarter_abbrevs = np.array([0] + [f"Q{i}" for i in range(1, 5)], dtype=object)
+        cols["quarter_abbrev"] = quarter_abbrevs[cols["quarter"]]
+    if "quarter_num_overall" in needed:
+        epoch_quarter = (epoch.month - 1) // 3 + 1
+        cols["quarter_num_overall"] = (cols["year"] - epoch.year) * 4 + cols["quarter"] - epoch_quarter + 1
+    if "year_half" in needed:
+        cols["year_half"] = np.where(cols["month"] < 7, 1, 2)
+    if "year_half_name" in needed:
+        half_abbrev = np.where(cols["year_half"] == 1, "H1", "H2")
+        cols["year_half_name"] = np.char.add(cols["year"].astype(str), half_abbrev).astype(object)
+    if "year_half_abbrev" in needed:
+        cols["year_half_abbrev"] = np.where(cols["year_half"] == 1, "H1", "H2").astype(object)
+    if "year_half_num_overall" in needed:
+        epoch_half = 1 if epoch.month < 7 else 2
+        cols["year_half_num_overall"] = (cols["year"] - epoch.year) * 2 + cols["year_half"] - epoch_half + 1
+    if "year_month" in needed:
+        cols["year_month"] = cols["year"] * 100 + cols["month"]
+    if "year_month_full" in needed:
+        cols["year_month_full"] = cols["full_date"].astype("<U7").astype(object)
+    if "is_peak_week" in needed:
+        cols["is_peak_week"] = peak_week_array(cols["date_key"])
+    if "is_holiday" in needed or "holiday_name" in needed:
+        cols["is_holiday"], cols["holiday_name"] = holiday_arrays(cols["date_key"])
+    if any(c in needed for c in holiday_columns):
+        mask = np.zeros(len(days), dtype=np.int64)
+        for bit, cal in enumerate(calendars):
+            tag = calendar_tag(cal)
+            flags, names = calendar_arrays(cols["date_key"], cal)
+            cols[f"is_holiday_{tag}"], cols[f"holiday_name_{tag}"] = flags, names
+            mask |= flags.astype(np.int64) << bit
+        cols["holiday_mask"] = mask
+    if any(c in needed for c in FISCAL_COLUMNS):
+        cols.update(fiscal_arrays(days, fiscal or RETAIL_CALENDAR, epoch))
+
+    return {c: cols[c] for c in columns}
+
+
+# scalar function of each column, date_key is the key itself
+COLUMN_FUNCTIONS = {c: globals()[c] for c in COLUMNS if c != "date_key"}
+
+
+def year_partitions(start, end):
+    """
+    Takes the first and last datetime.date of a range (inclusive) and returns it split into
+    (first, last) pairs, one per calendar year, in date order.
+    """
+    parts = []
+    first = start
+    while first <= end:
+        last = min(date(first.year, 12, 31), end)
+        parts.append((first, last))
+        if last == end:
             break
-        d = date_to_key(cur)
-        data.append(calculate_columns(d))
-        cur = cur + timedelta(days=1)
-    table = pd.DataFrame(data=data, columns=columns)
+        first = last + timedelta(days=1)
+    return parts
+
+
+def _partition_arrays(first, last, epoch, columns, calendars, fiscal):
+    import numpy as np
+
+    days = np.arange(first, last + timedelta(days=1), dtype="datetime64[D]")
+    return calculate_column_arrays(days, epoch, columns, calendars, fiscal)
+
+
+def calculate_partitioned_arrays(
+    start, end, epoch=EPOCH, columns=None, processes=None, calendars=None, fiscal=None
+):
+    """
+    Takes the first and last datetime.date of the range (inclusive) and returns the same dict of column
+    name -> array as calculate_column_arrays(), computed one year partition at a time in a pool of processes
+    (default: one per core) and merged in date order.  Every partition counts the *_num_overall columns from
+    the same epoch, so they run on across the partition boundaries.
+    """
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+
+    if columns is None:
+        columns = all_columns(calendars, fiscal)
+    parts = year_partitions(start, end)
+    if not parts:
+        return _partition_arrays(start, end, epoch, columns, calendars, fiscal)
+
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(
+            pool.map(
+                _partition_arrays,
+                [first for first, _ in parts],
+                [last for _, last in parts],
+                [epoch] * len(parts),
+                [columns] * len(parts),
+                [calendars] * len(parts),
+                [fiscal] * len(parts),
+                chunksize=max(1, len(parts) // (workers * 4)),
+            )
+        )
+
+    return {c: np.concatenate([r[c] for r in results]) for c in columns}
+
+
+def create_dataframe(
+    start=START_DATE,
+    end=END_DATE,
+    epoch=EPOCH,
+    columns=None,
+    compact=False,
+    processes=1,
+    calendars=None,
+    fiscal=None,
+):
+    """
+    Takes the first and last datetime.date of the range (inclusive) and returns the date dimension table
+    with the requested columns (default: all).  The *_num_overall columns are counted from epoch.
+    With compact, ints are downcast and repeating strings are categoricals to keep the table small in memory.
+    With processes other than 1 the years are built in parallel, see calculate_partitioned_arrays().
+    With calendars, a list of country codes or (country, subdivision) pairs, the holiday columns of each
+    calendar and holiday_mask are added, see calculate_column_arrays().  With fiscal, a FiscalCalendar such as
+    RETAIL_CALENDAR, the FISCAL_COLUMNS are added.
+    """
+    import numpy as np
+    import pandas as pd
+    from compact import compact_dataframe
+
+    if columns is None:
+        columns = all_columns(calendars, fiscal)
+    if processes == 1:
+        days = np.arange(start, end + timedelta(days=1), dtype="datetime64[D]")
+        values = calculate_column_arrays(days, epoch, columns, calendars, fiscal)
+    else:
+        values = calculate_partitioned_arrays(start, end, epoch, columns, processes, calendars, fiscal)
+    if compact:
+        return compact_dataframe(values, columns)
+    table = pd.DataFrame(values, columns=columns)
 
     return table
 
 
+def extend_dataframe(table, start=None, end=None, epoch=None, calendars=None, fiscal=None, compact=None):
+    """
+    Takes a table from create_dataframe() and returns it extended back to start and/or forward to end.
+    Only the new rows, and only the table's columns, are calculated.  The table needs its date_key column,
+    and the calendars and fiscal calendar it was built with if it has their columns.
+    The result is compacted again when compact is True or, by default, when the table is a compact one.
+    Unless given, the epoch is recovered from the table's day_num_overall (or is EPOCH when the table has none)
+    so the *_num_overall columns continue the existing rows.
+    """
+    import pandas as pd
+
+    columns = list(table.columns)
+    first = key_to_date(int(table["date_key"].iloc[0]))
+    last = key_to_date(int(table["date_key"].iloc[-1]))
+    if epoch is None:
+        epoch = EPOCH
+        if "day_num_overall" in table:
+            epoch = first - timedelta(days=int(table["day_num_overall"].iloc[0]) - 1)
+
+    options = {"calendars": calendars, "fiscal": fiscal}
+    parts = []
+    if start is not None and start < first:
+        parts.append(create_dataframe(start, first - timedelta(days=1), epoch, columns, **options))
+    parts.append(table)
+    if end is not None and end > last:
+        parts.append(create_dataframe(last + timedelta(days=1), end, epoch, columns, **options))
+    if len(parts) == 1:
+        return table
+
+    extended = pd.concat(parts, ignore_index=True)
+    if compact is None:
+        # a compact table has categorical strings or ints narrower than int64
+        compact = any(
+            isinstance(dtype, pd.CategoricalDtype) or (pd.api.types.is_integer_dtype(dtype) and dtype.itemsize < 8)
+            for dtype in table.dtypes
+        )
+    if compact:
+        from compact import compact_dataframe
+
+        return compact_dataframe({c: extended[c].to_numpy() for c in columns}, columns)
+    return extended
+
+
+def enrich(keys, columns=None, lookup=None, epoch=EPOCH, calendars=None, fiscal=None):
+    """
+    Takes a pandas Series or numpy array of date_keys and returns a DataFrame with the requested columns
+    (all by default, or all of the lookup table's) for every key.  The attributes are calculated once per
+    distinct key, or fetched from a DateLookup over a generated table when one is given, and then taken back
+    out to the rows.
+    The holiday columns of calendars and the fiscal columns are available as in create_dataframe().
+    """
+    if lookup is not None:
+        if columns is None:
+            columns = lookup.columns
+        missing = [c for c in columns if c not in lookup.columns]
+        if missing:
+            raise ValueError(f"Columns not in the lookup table: {missing}")
+    else:
+        if columns is None:
+            columns = all_columns(calendars, fiscal)
+        extra = (calendar_columns(calendars) if calendars else []) + FISCAL_COLUMNS
+        resolve_columns([c for c in columns if c not in extra])
+
+    def calculate(uniques):
+        if lookup is not None:
+            pos = lookup.positions(uniques)
+            if (pos < 0).any():
+                raise ValueError(f"{uniques[pos < 0][0]} is not in the lookup table")
+            return {c: lookup.table[c].to_numpy()[pos] for c in columns}
+        days = keys_to_days(uniques)
+        invalid = days_to_keys(days) != uniques
+        if invalid.any():
+            raise ValueError(f"{uniques[invalid][0]} is not a valid date_key")
+        return calculate_column_arrays(days, epoch, columns, calendars, fiscal)
+
+    return enrich_keys(keys, columns, calculate)
+
+
 if __name__ == "__main__":
+    from typed_output import write_parquet
+
     table = create_dataframe()
     table.to_csv("dates.csv")
+    write_parquet(table, "dates.parquet")
     print("Done")
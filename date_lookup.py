@@ -0,0 +1,88 @@
+import numpy as np
+from key_codec import days_to_keys, keys_to_days
+
+
+def build_slots(keys):
+    """
+    Takes a sorted int64 array of unique keys and returns the slot array from the first to the last key:
+    the row position of every key, -1 for the values in between that are not keys.
+    """
+    slots = np.full(int(keys[-1] - keys[0]) + 1, -1, dtype=np.int32)
+    slots[keys - keys[0]] = np.arange(len(keys), dtype=np.int32)
+    return slots
+
+
+class SlotIndex:
+    """
+    Key to row position lookups through a slot array from build_slots(), which subclasses keep in
+    self.slots together with the key of its first slot in self.first_key.
+    """
+
+    def position(self, k):
+        """
+        Takes a key and returns its row position in the table.  Raises KeyError if it is not in the table.
+        """
+        i = int(k) - self.first_key
+        if 0 <= i < len(self.slots):
+            pos = int(self.slots[i])
+            if pos >= 0:
+                return pos
+        raise KeyError(k)
+
+    def positions(self, keys):
+        """
+        Takes an array of keys and returns their row positions as an int64 array, -1 where a key is not in the table.
+        """
+        i = np.asarray(keys, dtype=np.int64) - self.first_key
+        inside = (i >= 0) & (i < len(self.slots))
+        pos = self.slots[np.where(inside, i, 0)].astype(np.int64)
+        pos[~inside] = -1
+        return pos
+
+
+class DateLookup(SlotIndex):
+    """
+    Direct-address index over a date dimension table.  Every date_key between the first and last key
+    has a slot holding its row position (-1 for the YYYYMMDD values that are not days), so lookups
+    never scan or hash the table.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.columns = list(table.columns)
+        self.keys = table["date_key"].to_numpy(dtype=np.int64)
+        if len(self.keys) == 0:
+            raise ValueError("DateLookup needs a table with at least one row")
+        expected = days_to_keys(keys_to_days(self.keys[:1])[0] + np.arange(len(self.keys)))
+        if (self.keys != expected).any():
+            raise ValueError("DateLookup needs one row per day, sorted by date_key and without gaps")
+
+        self.first_key = int(self.keys[0])
+        self.slots = build_slots(self.keys)
+        # rows as tuples in column order, the same shape calculate_columns() returns
+        self.rows = list(zip(*(table[c].tolist() for c in self.columns)))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, k):
+        try:
+            self.position(k)
+        except KeyError:
+            return False
+        return True
+
+    def lookup(self, k):
+        """
+        Takes a date_key and returns its row as a tuple in column order.  Raises KeyError if it is not in the table.
+        """
+        return self.rows[self.position(k)]
+
+    def lookup_many(self, keys):
+        """
+        Takes an array of date_keys and returns their rows as a DataFrame.  Raises KeyError if any key is not in the table.
+        """
+        pos = self.positions(keys)
+        if (pos < 0).any():
+            raise KeyError(np.asarray(keys)[pos < 0][0])
+        return self.table.iloc[pos].reset_index(drop=True)
@@ -0,0 +1,20 @@
+def enrich_keys(keys, columns, calculate):
+    """
+    Takes a pandas Series or numpy array of keys, the column names and a function of the distinct keys
+    (an int64 array) -> dict of column name -> array, and returns a DataFrame of the columns for every key,
+    with the index of keys when it is a Series.  The columns are calculated once per distinct key.
+    """
+    import numpy as np
+    import pandas as pd
+
+    index = keys.index if isinstance(keys, pd.Series) else None
+    codes, uniques = pd.factorize(np.asarray(keys, dtype=np.int64))
+    values = calculate(uniques)
+
+    # build each column over the distinct keys first so its dtype is settled before the take
+    table = pd.DataFrame(
+        {c: pd.Series(values[c]).take(codes).reset_index(drop=True) for c in columns}, columns=columns
+    )
+    if index is not None:
+        table.index = index
+    return table
@@ -0,0 +1,126 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import date_dimension
+import time_dimension
+from timestamp_keys import NULL_KEY, split_timestamps, to_utc
+
+CHUNK_SIZE = 1_000_000
+
+
+def _is_parquet(path):
+    return str(path).endswith(".parquet")
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE, columns=None):
+    """
+    Takes the path of a CSV or Parquet fact file and yields it as DataFrames of at most chunk_size rows,
+    so only one chunk is in memory at a time.
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+
+def key_chunk(chunk, timestamp_columns, tz="UTC", grain="second", date_columns=None, time_columns=None):
+    """
+    Takes a fact DataFrame and returns it with <column>_date_key and <column>_time_key added for every
+    timestamp column (see timestamp_keys.split_timestamps()).  The requested date and time dimension
+    attributes are added as <column>_<attribute>; <column>_time_zone is the zone abbreviation of each row
+    in tz.  The timestamp columns are converted to UTC datetimes and the attributes always have the nullable
+    dtype of their dimension column, so every chunk of a file has the same types.  Rows with a null timestamp
+    get NULL_KEY as keys and nulls as attributes.
+    """
+    chunk = chunk.copy()
+    for column in timestamp_columns:
+        timestamps = to_utc(chunk[column].to_numpy()).as_unit("us")
+        chunk[column] = pd.Series(timestamps, index=chunk.index)
+        date_keys, time_keys, zones = split_timestamps(timestamps, tz, grain)
+        valid = date_keys != NULL_KEY
+        chunk[f"{column}_date_key"] = date_keys
+        chunk[f"{column}_time_key"] = time_keys
+        if date_columns:
+            attributes = date_dimension.enrich(date_keys[valid], date_columns)
+            dtypes = _attribute_dtypes(date_dimension, tuple(date_columns))
+            for name in date_columns:
+                chunk[f"{column}_{name}"] = _with_nulls(attributes[name], valid, dtypes[name])
+        if time_columns:
+            attributes = time_dimension.enrich(time_keys[valid], time_columns)
+            dtypes = _attribute_dtypes(time_dimension, tuple(time_columns))
+            for name in time_columns:
+                if name == "time_zone":
+                    chunk[f"{column}_{name}"] = pd.array(zones, dtype="string")
+                else:
+                    chunk[f"{column}_{name}"] = _with_nulls(attributes[name], valid, dtypes[name])
+    return chunk
+
+
+@lru_cache(maxsize=None)
+def _attribute_dtypes(dimension, columns):
+    """
+    Takes a dimension module and a tuple of its column names and returns the nullable pandas dtype of each
+    column, taken from the dimension's own output rather than from the values of a chunk.
+    """
+    dtypes = {}
+    for name, dtype in dimension.enrich(np.zeros(0, dtype=np.int64), list(columns)).dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[name] = "boolean"
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[name] = "Int64"
+        else:
+            dtypes[name] = "string"
+    return dtypes
+
+
+def _with_nulls(values, valid, dtype):
+    """
+    Takes the attribute values of the valid rows, the valid mask and the nullable dtype of the attribute and
+    returns the values of all rows in that dtype, null on the invalid ones.
+    """
+    # position of each row among the valid rows, -1 (filled with NA by the take) for the invalid ones
+    positions = np.cumsum(valid) - 1
+    positions[~valid] = -1
+    return pd.array(values.to_numpy(), dtype=dtype).take(positions, allow_fill=True)
+
+
+def ingest(
+    source,
+    destination,
+    timestamp_columns,
+    tz="UTC",
+    grain="second",
+    date_columns=None,
+    time_columns=None,
+    chunk_size=CHUNK_SIZE,
+):
+    """
+    Takes a CSV or Parquet fact file and writes it to destination (CSV or Parquet, by extension) with the
+    dimension keys and attributes of key_chunk() added, one chunk at a time so memory stays bounded by
+    chunk_size whatever the file size.  Null timestamps are written with NULL_KEY keys and empty attributes.
+    Returns the number of rows written.
+    """
+    rows = 0
+    writer = None
+    try:
+        for chunk in read_chunks(source, chunk_size):
+            keyed = key_chunk(chunk, timestamp_columns, tz, grain, date_columns, time_columns)
+            if _is_parquet(destination):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(keyed, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(destination, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            else:
+                keyed.to_csv(destination, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            rows += len(keyed)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return rows
@@ -0,0 +1,177 @@
+def encode_date(y, m, d):
+    """
+    Takes a year, month and day as integers and returns the date_key format: int(YYYYMMDD)
+    """
+    return y * 10000 + m * 100 + d
+
+
+def decode_date(k):
+    """
+    Takes a date_key in YYYYMMDD format and returns the year, month and day as integers.
+    """
+    y, md = divmod(k, 10000)
+    m, d = divmod(md, 100)
+    return y, m, d
+
+
+def encode_date_array(y, m, d):
+    """
+    Takes arrays of years, months and days and returns the date_keys as an int64 array.
+    """
+    import numpy as np
+
+    y = np.asarray(y, dtype=np.int64)
+    m = np.asarray(m, dtype=np.int64)
+    d = np.asarray(d, dtype=np.int64)
+    return y * 10000 + m * 100 + d
+
+
+def decode_date_array(keys):
+    """
+    Takes an array of date_keys and returns the years, months and days as int64 arrays.
+    """
+    import numpy as np
+
+    keys = np.asarray(keys, dtype=np.int64)
+    y, md = np.divmod(keys, 10000)
+    m, d = np.divmod(md, 100)
+    return y, m, d
+
+
+def days_to_keys(days):
+    """
+    Takes a numpy datetime64 array and returns the date_keys of its days as an int64 array.
+    """
+    import numpy as np
+
+    days = np.asarray(days).astype("datetime64[D]").astype(np.int64)
+    return day_numbers_to_keys(days)
+
+
+def keys_to_days(keys):
+    """
+    Takes an array of date_keys and returns them as a numpy datetime64[D] array.
+    """
+    return keys_to_day_numbers(keys).astype("datetime64[D]")
+
+
+def day_numbers_to_keys(days):
+    """
+    Takes an array of day numbers (days since 1970-01-01) and returns the date_keys as an int64 array.
+    """
+    import numpy as np
+
+    # proleptic gregorian calendar in integer arithmetic, counted in 400-year eras starting on March 1st
+    z = np.asarray(days, dtype=np.int64) + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = np.where(mp < 10, mp + 3, mp - 9)
+    y = yoe + era * 400 + (m <= 2)
+    return encode_date_array(y, m, d)
+
+
+def keys_to_day_numbers(keys):
+    """
+    Takes an array of date_keys and returns the day numbers (days since 1970-01-01) as an int64 array.
+    """
+    import numpy as np
+
+    y, m, d = decode_date_array(keys)
+    y = y - (m <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * np.where(m > 2, m - 3, m + 9) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def encode_time(h, m, s):
+    """
+    Takes an hour, minute and second as integers and returns the time_key format: int(HHMMSS)
+    """
+    return h * 10000 + m * 100 + s
+
+
+def decode_time(k):
+    """
+    Takes a time_key in HHMMSS format and returns the hour, minute and second as integers.
+    """
+    h, ms = divmod(k, 10000)
+    m, s = divmod(ms, 100)
+    return h, m, s
+
+
+def encode_time_array(h, m, s):
+    """
+    Takes arrays of hours, minutes and seconds and returns the time_keys as an int64 array.
+    """
+    import numpy as np
+
+    h = np.asarray(h, dtype=np.int64)
+    m = np.asarray(m, dtype=np.int64)
+    s = np.asarray(s, dtype=np.int64)
+    return h * 10000 + m * 100 + s
+
+
+def decode_time_array(keys):
+    """
+    Takes an array of time_keys and returns the hours, minutes and seconds as int64 arrays.
+    """
+    import numpy as np
+
+    keys = np.asarray(keys, dtype=np.int64)
+    h, ms = np.divmod(keys, 10000)
+    m, s = np.divmod(ms, 100)
+    return h, m, s
+
+
+def seconds_to_time_keys(seconds):
+    """
+    Takes an array of seconds since midnight and returns the time_keys as an int64 array.
+    """
+    import numpy as np
+
+    seconds = np.asarray(seconds, dtype=np.int64)
+    return encode_time_array(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def time_keys_to_seconds(keys):
+    """
+    Takes an array of time_keys and returns the seconds since midnight as an int64 array.
+    """
+    h, m, s = decode_time_array(keys)
+    return h * 3600 + m * 60 + s
+
+
+def times_to_time_keys(times):
+    """
+    Takes a sequence of datetime.time and returns the time_keys as an int64 array.
+    """
+    import numpy as np
+
+    return np.fromiter((encode_time(t.hour, t.minute, t.second) for t in times), np.int64, len(times))
+
+
+def datetime64_to_time_keys(values):
+    """
+    Takes a numpy datetime64 array and returns the time_keys of its times of day as an int64 array.
+    """
+    import numpy as np
+
+    values = np.asarray(values).astype("datetime64[s]")
+    seconds = (values - values.astype("datetime64[D]")).astype(np.int64)
+    return seconds_to_time_keys(seconds)
+
+
+def epoch_to_time_keys(epoch_seconds):
+    """
+    Takes an array of seconds since 1970-01-01 00:00:00 UTC and returns the UTC time_keys as an int64 array.
+    """
+    import numpy as np
+
+    return seconds_to_time_keys(np.asarray(epoch_seconds, dtype=np.int64) % 86400)
+
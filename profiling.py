@@ -0,0 +1,197 @@
+"""
+Opt-in profiling of the dimension column functions and table builders.  Nothing is changed until
+profile_columns() is entered, so there is no cost when it is not used:
+
+    with profile_columns(date_dimension, time_dimension) as profiler:
+        date_dimension.calculate_columns(20231124)
+        date_dimension.create_dataframe()
+    print(profiler.report())
+
+Inside the vectorized builders each column block of calculate_column_arrays() is timed as well, reported as
+date_dimension[week_num_overall] and so on.
+"""
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+
+
+class ColumnProfiler:
+    """
+    Records calls, cumulative time (recursion counted once), own time and nested calls of wrapped functions,
+    and the time of each column block of the vectorized builders.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.total = {}
+        self.own = {}
+        self.nested = {}
+        self.blocks = {}
+        self.block_calls = {}
+        self._stack = []
+
+    def wrap(self, name, fn):
+        """
+        Takes a function name and the function and returns a wrapper that records every call of it.
+        """
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = self._stack[-1][0] if self._stack else None
+            if parent is not None:
+                self.nested[(parent, name)] = self.nested.get((parent, name), 0) + 1
+            recursive = any(frame[0] == name for frame in self._stack)
+            frame = [name, 0.0, []]
+            self._stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                for blocks in frame[2]:
+                    blocks.close()
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1][1] += elapsed
+                self.calls[name] = self.calls.get(name, 0) + 1
+                self.own[name] = self.own.get(name, 0.0) + elapsed - frame[1]
+                if not recursive:
+                    self.total[name] = self.total.get(name, 0.0) + elapsed
+
+        return wrapper
+
+    def column_blocks(self, prefix):
+        """
+        Takes a module name and returns the COLUMN_TIMER hook of that module: a function of the set of needed
+        columns of a calculate_column_arrays() call -> a ColumnBlocks set timing its column blocks.
+        """
+        return lambda needed: ColumnBlocks(needed, self, prefix)
+
+    def add_block(self, name, elapsed):
+        """
+        Takes a column block name and the seconds it took and adds them to the recorded numbers.
+        """
+        self.blocks[name] = self.blocks.get(name, 0.0) + elapsed
+        self.block_calls[name] = self.block_calls.get(name, 0) + 1
+
+    def as_dict(self):
+        """
+        Returns the recorded numbers as a dict of function name -> calls, total_s, own_s and nested call counts.
+        """
+        stats = {}
+        for name in self.calls:
+            stats[name] = {
+                "calls": self.calls[name],
+                "total_s": self.total.get(name, 0.0),
+                "own_s": self.own[name],
+                "calls_into": {child: n for (parent, child), n in self.nested.items() if parent == name},
+            }
+        for name in self.blocks:
+            stats[name] = {"calls": self.block_calls[name], "total_s": self.blocks[name]}
+        return stats
+
+    def report(self):
+        """
+        Returns the recorded numbers as a text table sorted by cumulative time, followed by the nested calls.
+        """
+        lines = [f"{'function':40} {'calls':>10} {'total ms':>12} {'own ms':>12} {'per call us':>12}"]
+        for name in sorted(self.calls, key=lambda n: self.total.get(n, 0.0), reverse=True):
+            calls = self.calls[name]
+            total = self.total.get(name, 0.0) * 1000
+            own = self.own[name] * 1000
+            lines.append(f"{name:40} {calls:>10} {total:>12.3f} {own:>12.3f} {total / calls * 1000:>12.2f}")
+        if self.blocks:
+            lines.append("")
+            lines.append(f"{'column block':40} {'calls':>10} {'total ms':>12}")
+            for name in sorted(self.blocks, key=self.blocks.get, reverse=True):
+                lines.append(f"{name:40} {self.block_calls[name]:>10} {self.blocks[name] * 1000:>12.3f}")
+        if self.nested:
+            lines.append("")
+            lines.append("nested calls")
+            for (parent, child), n in sorted(self.nested.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"  {parent} -> {child}: {n}")
+        return "\n".join(lines)
+
+
+class ColumnBlocks(set):
+    """
+    The needed columns of a calculate_column_arrays() call.  The builder tests the set once before each column
+    block, so the time from one successful test to the next is the time of the block of the first; a block
+    computing several columns is reported under the first one tested.  The last block ends when the profiled
+    calculate_column_arrays() returns.
+    """
+
+    def __init__(self, needed, profiler, prefix):
+        super().__init__(needed)
+        self.profiler = profiler
+        self.prefix = prefix
+        self.current = f"{prefix}[setup]"
+        self.start = time.perf_counter()
+        if profiler._stack:
+            profiler._stack[-1][2].append(self)
+
+    def __contains__(self, column):
+        found = super().__contains__(column)
+        if found:
+            self.close()
+            self.current = f"{self.prefix}[{column}]"
+        return found
+
+    def close(self):
+        """
+        Ends the current block and records its time.
+        """
+        now = time.perf_counter()
+        self.profiler.add_block(self.current, now - self.start)
+        self.start = now
+
+
+def _profiled_functions(module):
+    """
+    Takes a module and returns the names of the functions defined in it, including lru_cache wrapped ones.
+    """
+    names = []
+    for name, value in vars(module).items():
+        fn = getattr(value, "__wrapped__", value)
+        if inspect.isfunction(fn) and fn.__module__ == module.__name__:
+            names.append(name)
+    return names
+
+
+@contextmanager
+def profile_columns(*modules, profiler=None):
+    """
+    Takes dimension modules and, while the context is open, replaces their functions (column functions,
+    calculate_columns, the builders and their helpers) with recording wrappers.  The functions call each other
+    through the module globals, so nested calls are recorded too.  Yields the ColumnProfiler.
+    """
+    if profiler is None:
+        profiler = ColumnProfiler()
+
+    originals = []
+    for module in modules:
+        prefix = module.__name__
+        for name in _profiled_functions(module):
+            original = getattr(module, name)
+            originals.append((module, name, original))
+            setattr(module, name, profiler.wrap(f"{prefix}.{name}", original))
+        # date_dimension.calculate_columns() looks column functions up in COLUMN_FUNCTIONS
+        column_functions = getattr(module, "COLUMN_FUNCTIONS", None)
+        if column_functions is not None:
+            saved = dict(column_functions)
+            originals.append((column_functions, None, saved))
+            for name in column_functions:
+                column_functions[name] = getattr(module, name)
+        if hasattr(module, "COLUMN_TIMER"):
+            originals.append((module, "COLUMN_TIMER", module.COLUMN_TIMER))
+            module.COLUMN_TIMER = profiler.column_blocks(prefix)
+
+    try:
+        yield profiler
+    finally:
+        for target, name, original in reversed(originals):
+            if name is None:
+                target.update(original)
+            else:
+                setattr(target, name, original)
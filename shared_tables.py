@@ -0,0 +1,115 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from compact import smallest_int_type
+from date_lookup import SlotIndex, build_slots
+
+MANIFEST = "manifest.json"
+
+
+def save_table(table, directory):
+    """
+    Takes a dimension table DataFrame and writes it to directory as fixed-width .npy column arrays:
+    ints in the smallest int type, bools as bool and strings as integer codes plus a dictionary.
+    The first column is the key, and a slot array maps every key between the first and last to its row.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"columns": [], "key_column": str(table.columns[0])}
+
+    for name in table.columns:
+        values = table[name]
+        if pd.api.types.is_bool_dtype(values):
+            kind = "bool"
+            np.save(os.path.join(directory, f"{name}.npy"), values.to_numpy(dtype=bool))
+        elif pd.api.types.is_integer_dtype(values):
+            kind = "int"
+            ints = values.to_numpy(dtype=np.int64)
+            np.save(os.path.join(directory, f"{name}.npy"), ints.astype(smallest_int_type(ints)))
+        else:
+            kind = "string"
+            codes, dictionary = pd.factorize(values.to_numpy(dtype=object))
+            np.save(os.path.join(directory, f"{name}.codes.npy"), codes.astype(smallest_int_type(codes)))
+            np.save(os.path.join(directory, f"{name}.dictionary.npy"), np.array(list(dictionary), dtype=str))
+        manifest["columns"].append({"name": str(name), "kind": kind})
+
+    keys = table.iloc[:, 0].to_numpy(dtype=np.int64)
+    if len(keys) == 0 or (np.diff(keys) <= 0).any():
+        raise ValueError("save_table needs a non-empty table sorted by its unique key column")
+    np.save(os.path.join(directory, "slots.npy"), build_slots(keys))
+    manifest["first_key"] = int(keys[0])
+    manifest["rows"] = len(keys)
+
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+class MappedTable(SlotIndex):
+    """
+    A table written by save_table(), memory-mapped read-only.  The column arrays live in the page cache and
+    are shared by every process that maps the same files; key lookups read the mapped slot array directly.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        self.directory = directory
+        self.columns = [c["name"] for c in manifest["columns"]]
+        self.kinds = {c["name"]: c["kind"] for c in manifest["columns"]}
+        self.key_column = manifest["key_column"]
+        self.first_key = manifest["first_key"]
+        self.rows = manifest["rows"]
+        self.slots = self._load("slots.npy")
+        self.arrays = {}
+        self.dictionaries = {}
+        for name in self.columns:
+            if self.kinds[name] == "string":
+                self.arrays[name] = self._load(f"{name}.codes.npy")
+                self.dictionaries[name] = self._load(f"{name}.dictionary.npy")
+            else:
+                self.arrays[name] = self._load(f"{name}.npy")
+
+    def _load(self, filename):
+        return np.load(os.path.join(self.directory, filename), mmap_mode="r")
+
+    def __len__(self):
+        return self.rows
+
+    def value(self, name, pos):
+        """
+        Takes a column name and a row position and returns the value as a python scalar.
+        """
+        if self.kinds[name] == "string":
+            return str(self.dictionaries[name][self.arrays[name][pos]])
+        return self.arrays[name][pos].item()
+
+    def lookup(self, k):
+        """
+        Takes a key and returns its row as a tuple in column order.  Raises KeyError if it is not in the table.
+        """
+        pos = self.position(k)
+        return tuple(self.value(name, pos) for name in self.columns)
+
+    def column(self, name, positions=None):
+        """
+        Takes a column name and optional row positions and returns the values as an array.  Numeric columns
+        without positions are the mapped array itself; strings are decoded from their dictionary.
+        """
+        values = self.arrays[name] if positions is None else self.arrays[name][positions]
+        if self.kinds[name] == "string":
+            return self.dictionaries[name][values]
+        return values
+
+    def to_dataframe(self, columns=None):
+        """
+        Returns the requested columns (default: all) as a DataFrame, with the strings as categoricals.
+        """
+        if columns is None:
+            columns = self.columns
+        data = {}
+        for name in columns:
+            if self.kinds[name] == "string":
+                data[name] = pd.Categorical.from_codes(self.arrays[name], self.dictionaries[name])
+            else:
+                data[name] = np.asarray(self.arrays[name])
+        return pd.DataFrame(data, columns=columns)
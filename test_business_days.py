@@ -0,0 +1,47 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+import date_dimension
+from business_days import BusinessDays
+
+
+@pytest.fixture(scope="module")
+def table():
+    return date_dimension.create_dataframe(date(2019, 1, 1), date(2025, 12, 31))
+
+
+def test_offset_and_between_match_day_by_day(table):
+    business_days = BusinessDays(table)
+    keys = table["date_key"].tolist()
+    business = (~table["is_weekend"] & ~table["is_holiday"]).tolist()
+    rng = np.random.default_rng(0)
+    starts, steps, expected = [], [], []
+    for _ in range(500):
+        i = int(rng.integers(60, len(keys) - 60))
+        n = int(rng.integers(-40, 41))
+        j, step, counted = i, 1 if n > 0 else -1, 0
+        while counted != abs(n):
+            j += step
+            counted += business[j]
+        assert business_days.offset(keys[i], n) == keys[j]
+        assert business_days.between(keys[i], keys[j]) == (n if n > 0 else -sum(business[j + 1 : i + 1]))
+        starts.append(keys[i])
+        steps.append(n)
+        expected.append(keys[j])
+    assert business_days.offset_many(np.array(starts), np.array(steps)).tolist() == expected
+    assert business_days.between_many(np.array(starts), np.array(expected)).tolist() == [
+        business_days.between(a, b) for a, b in zip(starts, expected)
+    ]
+
+
+def test_outside_the_table(table):
+    business_days = BusinessDays(table)
+    assert not business_days.is_business_day(20231124)
+    with pytest.raises(KeyError):
+        business_days.offset(20260101, 1)
+    with pytest.raises(ValueError):
+        business_days.offset(20251230, 5)
+    with pytest.raises(ValueError):
+        business_days.offset_many(np.array([20190102, 20190103]), -3)
@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+import date_dimension
+from date_bitmaps import DateBitmaps
+
+
+@pytest.fixture(scope="module")
+def table():
+    return date_dimension.create_dataframe(date(2019, 1, 1), date(2025, 12, 31))
+
+
+def test_queries_match_filters(table):
+    bitmaps = DateBitmaps(table)
+    keys = table["date_key"].to_numpy()
+    assert len(bitmaps) == len(table)
+    query = bitmaps.query(quarter=4, is_weekend=True)
+    assert (bitmaps.keys(query) == keys[(table["quarter"] == 4) & table["is_weekend"]]).all()
+    months = bitmaps.match("month", [1, 2])
+    assert (bitmaps.keys(months) == keys[table["month"].isin([1, 2])]).all()
+    assert (bitmaps.keys(bitmaps.negate(months)) == keys[~table["month"].isin([1, 2])]).all()
+    in_range = bitmaps.date_range(20231101, 20231130) & bitmaps.match("is_weekend")
+    assert bitmaps.count(in_range) == 8
+    assert bitmaps.count(bitmaps.match("holiday_name", "Black Friday")) == 7
+    assert bitmaps.count(bitmaps.match("quarter", 9)) == 0
+
+
+def test_stored_bitmaps_are_not_modified(table):
+    bitmaps = DateBitmaps(table)
+    unknown = bitmaps.match("quarter", 9)
+    unknown |= bitmaps.all
+    weekends = bitmaps.match("is_weekend")
+    weekends &= bitmaps.none
+    assert bitmaps.count(bitmaps.match("quarter", 9)) == 0
+    assert bitmaps.count(bitmaps.match("is_weekend")) == int(table["is_weekend"].sum())
+    with pytest.raises(ValueError):
+        bitmaps.all |= bitmaps.none
+    with pytest.raises(KeyError):
+        bitmaps.match("date_key", 20230101)
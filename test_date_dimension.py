@@ -0,0 +1,124 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import date_dimension
+from date_lookup import DateLookup
+
+START = date(2019, 1, 1)
+END = date(2025, 12, 31)
+EPOCHS = [date_dimension.EPOCH, date(1995, 6, 15), date(2021, 3, 3)]
+FISCAL_CALENDARS = [
+    date_dimension.RETAIL_CALENDAR,
+    date_dimension.FiscalCalendar(end_month=12, week_end=7, pattern=(5, 4, 4), end_rule="last"),
+    date_dimension.FiscalCalendar(end_month=6, week_end=5, pattern=(4, 5, 4), end_rule="nearest"),
+]
+
+
+def test_create_dataframe_matches_calculate_columns():
+    table = date_dimension.create_dataframe(START, END)
+    rows = list(table.itertuples(index=False, name=None))
+    assert rows == [date_dimension.calculate_columns(k) for k in table["date_key"].tolist()]
+
+
+def test_holiday_index_derives_black_friday_and_cyber_monday():
+    assert date_dimension.holiday_name(20231123) == "Thanksgiving"
+    assert date_dimension.holiday_name(20231124) == "Black Friday"
+    assert date_dimension.holiday_name(20231127) == "Cyber Monday"
+    assert date_dimension.holiday_name(20231126) == "Not Applicable"
+    table = date_dimension.create_dataframe(START, END, columns=["date_key", "is_holiday", "holiday_name"])
+    assert table["holiday_name"].value_counts()["Black Friday"] == 7
+    assert (table["is_holiday"] == (table["holiday_name"] != "Not Applicable")).all()
+
+
+def test_peak_week_runs_from_tuesday_to_cyber_monday():
+    peak_2019 = [20191126, 20191127, 20191128, 20191129, 20191130, 20191201, 20191202]
+    assert sorted(date_dimension.peak_week_index(2019)) == peak_2019
+    table = date_dimension.create_dataframe(date(2019, 1, 1), date(2019, 12, 31), columns=["date_key", "is_peak_week"])
+    assert table.loc[table["is_peak_week"], "date_key"].tolist() == peak_2019
+
+
+@pytest.mark.parametrize("epoch", EPOCHS)
+def test_overall_columns_match_scalar_functions(epoch):
+    table = date_dimension.create_dataframe(START, END, epoch)
+    rows = list(table.itertuples(index=False, name=None))
+    assert rows == [date_dimension.calculate_columns(k, epoch) for k in table["date_key"].tolist()]
+    for c in date_dimension.OVERALL_COLUMNS:
+        fn = getattr(date_dimension, c)
+        assert table[c].tolist() == [fn(k, epoch) for k in table["date_key"].tolist()], c
+
+
+def test_extend_dataframe_matches_a_full_build():
+    full = date_dimension.create_dataframe(START, END, date(1995, 6, 15))
+    part = date_dimension.create_dataframe(date(2021, 1, 1), date(2022, 6, 30), date(1995, 6, 15))
+    pd.testing.assert_frame_equal(date_dimension.extend_dataframe(part, START, END), full)
+
+    columns = ["date_key", "day_num_overall", "month_name"]
+    part = date_dimension.create_dataframe(date(2021, 1, 1), date(2022, 6, 30), columns=columns)
+    extended = date_dimension.extend_dataframe(part, end=END)
+    pd.testing.assert_frame_equal(extended, date_dimension.create_dataframe(date(2021, 1, 1), END, columns=columns))
+    assert date_dimension.extend_dataframe(part) is part
+
+
+def test_enrich_matches_the_table_with_and_without_a_lookup():
+    table = date_dimension.create_dataframe(START, END)
+    keys = pd.Series([20231124, 20240229, 20231124], index=[7, 8, 9])
+    enriched = date_dimension.enrich(keys, ["date_key", "holiday_name", "week_num_overall"])
+    assert enriched.index.tolist() == [7, 8, 9]
+    expected = table.set_index("date_key").loc[keys.tolist(), ["holiday_name", "week_num_overall"]]
+    assert enriched[["holiday_name", "week_num_overall"]].values.tolist() == expected.values.tolist()
+    pd.testing.assert_frame_equal(date_dimension.enrich(keys), date_dimension.enrich(keys, lookup=DateLookup(table)))
+
+    subset = DateLookup(table[["date_key", "quarter"]])
+    assert date_dimension.enrich(keys, lookup=subset).columns.tolist() == ["date_key", "quarter"]
+    with pytest.raises(ValueError):
+        date_dimension.enrich(keys, ["full_date"], lookup=subset)
+    with pytest.raises(ValueError):
+        date_dimension.enrich(np.array([20230230]))
+
+
+def test_parallel_build_matches_serial():
+    serial = date_dimension.create_dataframe(START, END, date(1995, 6, 15), calendars=["US", ("CA", "ON")])
+    parallel = date_dimension.create_dataframe(
+        START, END, date(1995, 6, 15), processes=2, calendars=["US", ("CA", "ON")]
+    )
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_calendar_columns_match_scalar_functions():
+    calendars = ["US", ("CA", "ON"), "GB"]
+    table = date_dimension.create_dataframe(date(2023, 1, 1), date(2024, 12, 31), calendars=calendars)
+    assert list(table.columns) == date_dimension.all_columns(calendars)
+    for k, mask in zip(table["date_key"].tolist()[::3], table["holiday_mask"].tolist()[::3]):
+        row = table.loc[table["date_key"] == k].iloc[0]
+        for i, cal in enumerate(calendars):
+            tag = date_dimension.calendar_tag(cal)
+            assert row[f"is_holiday_{tag}"] == date_dimension.is_calendar_holiday(k, cal), (cal, k)
+            assert row[f"holiday_name_{tag}"] == date_dimension.calendar_holiday_name(k, cal), (cal, k)
+            assert bool(mask >> i & 1) == date_dimension.is_calendar_holiday(k, cal), (cal, k)
+    assert date_dimension.calendar_holiday_name(20230701, ("CA", "ON")) == "Canada Day"
+    with pytest.raises(ValueError):
+        date_dimension.create_dataframe(START, END, calendars=["XX"])
+
+
+@pytest.mark.parametrize("epoch", EPOCHS)
+@pytest.mark.parametrize("fiscal", FISCAL_CALENDARS)
+def test_fiscal_columns_match_scalar_functions(epoch, fiscal):
+    columns = ["date_key"] + date_dimension.FISCAL_COLUMNS
+    table = date_dimension.create_dataframe(START, END, epoch, columns, fiscal=fiscal)
+    keys = table["date_key"].tolist()
+    for c in date_dimension.FISCAL_COLUMNS:
+        fn = getattr(date_dimension, c)
+        expected = [fn(k, epoch, fiscal) if c.endswith("_num_overall") else fn(k, fiscal) for k in keys]
+        assert table[c].tolist() == expected, c
+
+
+def test_retail_calendar_years():
+    periods = date_dimension.fiscal_periods(2023)
+    assert periods[0] == date(2023, 1, 29)
+    assert periods[-1] == date(2024, 2, 4)
+    assert date_dimension.fiscal_week(20240203) == 53
+    with pytest.raises(ValueError):
+        date_dimension.fiscal_calendar(date_dimension.RETAIL_CALENDAR._replace(end_month=13))
@@ -0,0 +1,39 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+import date_dimension
+from date_lookup import DateLookup
+
+
+@pytest.fixture(scope="module")
+def table():
+    return date_dimension.create_dataframe(date(2019, 1, 1), date(2025, 12, 31))
+
+
+def test_lookup_returns_the_rows_of_calculate_columns(table):
+    lookup = DateLookup(table)
+    assert len(lookup) == len(table)
+    assert lookup.position(20190101) == 0
+    assert lookup.lookup(20240229) == date_dimension.calculate_columns(20240229)
+    assert 20231124 in lookup
+    assert 20230230 not in lookup
+    assert 20260101 not in lookup
+    with pytest.raises(KeyError):
+        lookup.position(20230230)
+
+
+def test_lookup_many_and_positions(table):
+    lookup = DateLookup(table)
+    keys = np.array([20251231, 20190101, 20230230, 18000101])
+    assert lookup.positions(keys).tolist() == [len(table) - 1, 0, -1, -1]
+    rows = lookup.lookup_many(keys[:2])
+    assert rows["date_key"].tolist() == [20251231, 20190101]
+    with pytest.raises(KeyError):
+        lookup.lookup_many(keys)
+
+
+def test_lookup_needs_contiguous_days(table):
+    with pytest.raises(ValueError):
+        DateLookup(table.drop(index=5))
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from ingest import ingest, key_chunk
+
+ROWS = [
+    ("1", ""),
+    ("2", ""),
+    ("3", "2023-07-01T12:00:00Z"),
+    ("4", ""),
+    ("5", "2023-01-01T03:04:05Z"),
+    ("6", "2024-02-29T23:59:59Z"),
+]
+OPTIONS = dict(
+    tz="America/Denver",
+    date_columns=["day_of_week", "month_name", "is_weekend"],
+    time_columns=["hour", "time_zone"],
+)
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def source(request, tmp_path):
+    path = tmp_path / "facts.csv"
+    path.write_text("id,ts\n" + "".join(f"{i},{ts}\n" for i, ts in ROWS))
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+        pd.read_csv(path).to_parquet(tmp_path / "facts.parquet")
+        path = tmp_path / "facts.parquet"
+    return path
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_ingest_in_chunks_matches_one_chunk(source, tmp_path, extension):
+    if extension == "parquet":
+        pytest.importorskip("pyarrow")
+    destination = tmp_path / f"keyed.{extension}"
+    # the first chunk holds only null timestamps
+    assert ingest(source, destination, ["ts"], chunk_size=2, **OPTIONS) == len(ROWS)
+
+    whole = pd.read_parquet(source) if source.suffix == ".parquet" else pd.read_csv(source)
+    expected = key_chunk(whole, ["ts"], **OPTIONS)
+    columns = [c for c in expected.columns if c.startswith("ts_")]
+    expected = expected[columns]
+    if extension == "parquet":
+        written = pd.read_parquet(destination, columns=columns, dtype_backend="numpy_nullable")
+    else:
+        written = pd.read_csv(destination, usecols=columns, dtype=expected.dtypes.astype(str).to_dict())
+    pd.testing.assert_frame_equal(written, expected, check_dtype=False)
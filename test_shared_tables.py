@@ -0,0 +1,46 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import date_dimension
+import time_dimension
+from date_lookup import DateLookup
+from shared_tables import MappedTable, save_table
+
+
+@pytest.fixture(scope="module")
+def table():
+    return date_dimension.create_dataframe(date(2019, 1, 1), date(2025, 12, 31))
+
+
+def test_mapped_table_matches_the_date_lookup(table, tmp_path):
+    save_table(table, tmp_path)
+    mapped = MappedTable(tmp_path)
+    lookup = DateLookup(table)
+    assert len(mapped) == len(table)
+    assert mapped.columns == list(table.columns)
+
+    keys = np.array([20190101, 20231124, 20240229, 20251231, 20181231, 20260101, 20230230])
+    assert (mapped.positions(keys) == lookup.positions(keys)).all()
+    for k in [20190101, 20231124, 20240229, 20251231]:
+        assert mapped.lookup(k) == lookup.lookup(k)
+    with pytest.raises(KeyError):
+        mapped.lookup(20260101)
+
+
+def test_to_dataframe_matches_the_table(table, tmp_path):
+    save_table(table, tmp_path)
+    frame = MappedTable(tmp_path).to_dataframe()
+    for name in table.columns:
+        assert frame[name].tolist() == table[name].tolist(), name
+
+
+def test_time_table(tmp_path):
+    table = time_dimension.create_dataframe()
+    save_table(table, tmp_path)
+    mapped = MappedTable(tmp_path)
+    assert mapped.lookup(134712) == time_dimension.calculate_columns(134712)
+    assert mapped.column("time_key", mapped.positions(np.array([0, 235959]))).tolist() == [0, 235959]
+    pd.testing.assert_frame_equal(mapped.to_dataframe(["hour", "minute"]), table[["hour", "minute"]], check_dtype=False)
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import time_dimension
+from key_codec import time_keys_to_seconds
+
+
+def test_create_dataframe_matches_calculate_columns():
+    table = time_dimension.create_dataframe()
+    rows = list(table.itertuples(index=False, name=None))
+    assert rows == [time_dimension.calculate_columns(k) for k in table["time_key"].tolist()]
+
+
+@pytest.mark.parametrize("grain", list(time_dimension.GRAINS))
+def test_grain_tables_hold_the_start_of_each_bucket(grain):
+    table = time_dimension.create_dataframe(grain)
+    assert len(table) == time_dimension.SECONDS_PER_DAY // time_dimension.GRAINS[grain]
+    assert table["time_key"].iloc[0] == 0
+    seconds = time_keys_to_seconds(table["time_key"].to_numpy())
+    last_second = seconds + time_dimension.GRAINS[grain] - 1
+    assert (time_dimension.bucket(last_second, grain) == table["time_key"].to_numpy()).all()
+
+
+def test_bucket():
+    timestamps = np.array(["2023-07-01T13:47:12", "2023-07-01T00:00:59"], dtype="datetime64[s]")
+    assert time_dimension.bucket(timestamps).tolist() == [134712, 59]
+    assert time_dimension.bucket(timestamps, "15minute").tolist() == [134500, 0]
+    assert time_dimension.bucket(timestamps, "hour").tolist() == [130000, 0]
+    aware = pd.Series(pd.to_datetime(timestamps)).dt.tz_localize("UTC").dt.tz_convert("America/Denver")
+    assert time_dimension.bucket(aware, "minute").tolist() == [74700, 180000]
+    assert time_dimension.bucket(np.array([86399, 86400 + 61]), "minute").tolist() == [235900, 100]
+    with pytest.raises(ValueError):
+        time_dimension.bucket(timestamps, "week")
@@ -0,0 +1,20 @@
+import pandas as pd
+
+from timestamp_keys import NULL_KEY, split_timestamps
+
+
+def test_split_timestamps_nulls():
+    timestamps = pd.Series(pd.to_datetime(["2023-07-01 12:00:00", None]))
+    date_keys, time_keys, zones = split_timestamps(timestamps, "America/Denver")
+    assert date_keys.tolist() == [20230701, NULL_KEY]
+    assert time_keys.tolist() == [60000, NULL_KEY]
+    assert zones.tolist() == ["MDT", None]
+
+
+def test_split_timestamps_follows_daylight_saving_time():
+    # 2023-03-12 08:59:59 UTC is the last second of MST in Denver, 09:00:00 UTC the first of MDT
+    timestamps = pd.to_datetime(["2023-03-12 08:59:59", "2023-03-12 09:00:00", "2023-11-05 08:00:00"], utc=True)
+    date_keys, time_keys, zones = split_timestamps(timestamps, "America/Denver", grain="minute")
+    assert date_keys.tolist() == [20230312, 20230312, 20231105]
+    assert time_keys.tolist() == [15900, 30000, 10000]
+    assert zones.tolist() == ["MST", "MDT", "MST"]
@@ -0,0 +1,35 @@
+from datetime import date
+
+import pytest
+
+import date_dimension
+import time_dimension
+from typed_output import arrow_table, read_table, write_arrow, write_parquet
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_arrow_types():
+    dates = arrow_table(date_dimension.create_dataframe(date(2023, 1, 1), date(2023, 12, 31)))
+    assert dates.schema.field("full_date").type == pa.date32()
+    assert dates.schema.field("week_begin_date").type == pa.date32()
+    assert dates.schema.field("day").type == pa.int8()
+    assert dates.schema.field("date_key").type == pa.int32()
+    assert dates.schema.field("is_weekend").type == pa.bool_()
+    assert pa.types.is_dictionary(dates.schema.field("month_name").type)
+    assert dates.column("full_date")[0].as_py() == date(2023, 1, 1)
+
+    times = arrow_table(time_dimension.create_dataframe("minute"))
+    assert times.schema.field("full_time").type == pa.time32("s")
+    assert times.column("full_time")[61].as_py().isoformat() == "01:01:00"
+
+
+@pytest.mark.parametrize("filename", ["dates.parquet", "dates.arrow"])
+def test_written_files_read_back(tmp_path, filename):
+    table = date_dimension.create_dataframe(date(2023, 1, 1), date(2023, 12, 31))
+    path = tmp_path / filename
+    (write_parquet if filename.endswith(".parquet") else write_arrow)(table, str(path))
+    read = read_table(str(path), ["date_key", "month_name", "holiday_name"])
+    assert read["date_key"].tolist() == table["date_key"].tolist()
+    assert read["month_name"].astype(str).tolist() == table["month_name"].tolist()
+    assert read["holiday_name"].astype(str).tolist() == table["holiday_name"].tolist()
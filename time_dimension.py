@@ -1,5 +1,46 @@
-from datetime import datetime, timedelta
-import pandas as pd
+from key_codec import (
+    encode_time,
+    decode_time,
+    encode_time_array,
+    seconds_to_time_keys,
+    time_keys_to_seconds,
+)
+from enrichment import enrich_keys
+
+# global variables
+SECONDS_PER_DAY = 86400
+# seconds in each supported grain of the time dimension
+GRAINS = {
+    "second": 1,
+    "minute": 60,
+    "5minute": 300,
+    "15minute": 900,
+    "30minute": 1800,
+    "hour": 3600,
+}
+COLUMNS = [
+    "time_key",
+    "full_time",
+    "time_string",
+    "time_12_full_string",
+    "time_12_short_string",
+    "time_zone",
+    "hour",
+    "hour_string",
+    "hour_12",
+    "hour_12_string",
+    "meridiem",
+    "half_hour",
+    "minute",
+    "minute_string",
+    "minute_code",
+    "minute_full_string",
+    "second",
+    "second_string",
+]
+# set by profiling.profile_columns() to time each column block of calculate_column_arrays()
+COLUMN_TIMER = None
+TWO_DIGITS = [f"{i:02d}" for i in range(60)]
 
 
 def calculate_columns(time_key):
@@ -29,83 +70,22 @@ def time_to_key(ktime):
     """
     Takes a datetime.time object and converts it into a time_key HHMMSS
     """
-    h = ktime.hour
-    m = ktime.minute
-    s = ktime.second
-
-    h_zero = ""
-    m_zero = ""
-    s_zero = ""
-
-    if h < 10:
-        h_zero = "0"
-    if m < 10:
-        m_zero = "0"
-    if s < 10:
-        s_zero = "0"
-
-    return int(f"{h_zero}{h}{m_zero}{m}{s_zero}{s}")
+    return encode_time(ktime.hour, ktime.minute, ktime.second)
 
 
 def hms_int(k):
     """
     Takes a time_key k in format HHMMSS and returns the hour, minute and seconds as integers.
     """
-    k_string = str(k)
-    klength = len(k_string)
-    if klength < 6:
-        # we have leading zeroes
-        if klength == 5:
-            # one leading zero.  hour is the first character
-            h = int(k_string[0])
-            m = int(k_string[1:3])
-            s = int(k_string[3:])
-        elif klength == 4:
-            # two leading zeroes.  minutes first.
-            h = 0
-            m = int(k_string[:2])
-            s = int(k_string[2:])
-        elif klength == 3:
-            # three leading zeroes.  minute is the first character
-            h = 0
-            m = int(k_string[0])
-            s = int(k_string[1:])
-        elif klength <= 2 and klength > 0:
-            # four or five leading zeroes.  seconds only
-            h = 0
-            m = 0
-            s = int(k_string)
-        elif klength == 0:
-            # all zeroes
-            h = 0
-            m = 0
-            s = 0
-        else:
-            raise Exception(f"A problem occurred in hms_int({k})")
-    else:
-        h = int(k_string[:2])
-        m = int(k_string[2:4])
-        s = int(k_string[4:])
-
-    return h, m, s
+    return decode_time(k)
 
 
 def hms_str(k):
     """
     Takes a time_key k in format HHMMSS and returns the hour, minute and seconds as strings.
     """
-    h_zero = ""
-    m_zero = ""
-    s_zero = ""
-    h, m, s = hms_int(k)
-    if h < 10:
-        h_zero = "0"
-    if m < 10:
-        m_zero = "0"
-    if s < 10:
-        s_zero = "0"
-
-    return f"{h_zero}{h}", f"{m_zero}{m}", f"{s_zero}{s}"
+    h, m, s = decode_time(k)
+    return TWO_DIGITS[h], TWO_DIGITS[m], TWO_DIGITS[s]
 
 
 def full_time(k):
@@ -283,43 +263,152 @@ def second_string(k):
     return s
 
 
-def create_dataframe():
-    columns = [
-        "time_key",
-        "full_time",
-        "time_string",
-        "time_12_full_string",
-        "time_12_short_string",
-        "time_zone",
-        "hour",
-        "hour_string",
-        "hour_12",
-        "hour_12_string",
-        "meridiem",
-        "half_hour",
-        "minute",
-        "minute_string",
-        "minute_code",
-        "minute_full_string",
-        "second",
-        "second_string",
-    ]
-    data = []
-
-    cur = datetime(1, 1, 1, 0, 0, 0)
-
-    while True:
-        if cur.day == 2:
-            break
-        k = time_to_key(cur.time())
-        data.append(calculate_columns(k))
-        cur = cur + timedelta(seconds=1)
-    table = pd.DataFrame(data=data, columns=columns)
+def calculate_column_arrays(seconds, zone="UTC", columns=None):
+    """
+    Takes a numpy array of seconds since midnight and returns a dict of column name -> array with the
+    same values calculate_columns() produces for each time, computed for the whole array at once.
+    Only the requested columns (default: all) are calculated.
+    The time_zone column holds zone, such as an abbreviation from timestamp_keys.split_timestamps().
+    """
+    import numpy as np
+
+    if columns is None:
+        columns = COLUMNS
+    needed = set(columns)
+    if COLUMN_TIMER is not None:
+        needed = COLUMN_TIMER(needed)
+    seconds = np.asarray(seconds, dtype=np.int64)
+    h = seconds // 3600
+    m = seconds // 60 % 60
+    s = seconds % 60
+    h_12 = np.where(h == 0, 12, np.where(h > 12, h - 12, h))
+
+    two_digits = np.array(TWO_DIGITS, dtype=object)
+    h_str = two_digits[h]
+    m_str = two_digits[m]
+    s_str = two_digits[s]
+    am_pm = np.where(h < 12, "AM", "PM").astype(object)
+    cols = {}
+
+    if "time_key" in needed:
+        cols["time_key"] = encode_time_array(h, m, s)
+    if "full_time" in needed:
+        cols["full_time"] = h_str + ":" + m_str + ":" + s_str
+    if "time_string" in needed:
+        cols["time_string"] = h_str + ":" + m_str + ":" + s_str
+    if "time_12_full_string" in needed:
+        # time_12_full_string() leaves midnight as 00 where the other 12-hour columns use 12
+        h_12_full = two_digits[np.where(h > 12, h - 12, h)]
+        cols["time_12_full_string"] = h_12_full + ":" + m_str + ":" + s_str + " " + am_pm
+    if "time_12_short_string" in needed:
+        cols["time_12_short_string"] = two_digits[h_12] + ":" + m_str + " " + am_pm
+    if "time_zone" in needed:
+        cols["time_zone"] = np.full(len(seconds), zone, dtype=object)
+    if "hour" in needed:
+        cols["hour"] = h
+    if "hour_string" in needed:
+        cols["hour_string"] = h_str
+    if "hour_12" in needed:
+        cols["hour_12"] = h_12
+    if "hour_12_string" in needed:
+        cols["hour_12_string"] = two_digits[h_12]
+    if "meridiem" in needed:
+        cols["meridiem"] = am_pm
+    if "half_hour" in needed:
+        cols["half_hour"] = np.where(m >= 30, 2, 1)
+    if "minute" in needed:
+        cols["minute"] = m
+    if "minute_string" in needed:
+        cols["minute_string"] = m_str
+    if "minute_code" in needed:
+        cols["minute_code"] = h * 100 + m
+    if "minute_full_string" in needed:
+        cols["minute_full_string"] = h_str + ":" + m_str + ":00"
+    if "second" in needed:
+        cols["second"] = s
+    if "second_string" in needed:
+        cols["second_string"] = s_str
+
+    return {c: cols[c] for c in columns}
+
+
+def grain_seconds(grain):
+    """
+    Takes a grain name from GRAINS and returns its length in seconds.
+    """
+    if grain not in GRAINS:
+        raise ValueError(f"Unknown grain {grain!r}, expected one of {list(GRAINS)}")
+    return GRAINS[grain]
+
+
+def create_dataframe(grain="second", zone="UTC", compact=False):
+    """
+    Returns the time dimension table with one row per grain of the day (default: every second)
+    and zone in the time_zone column.  With compact, ints are downcast and repeating strings are
+    categoricals to keep the table small in memory.
+    """
+    import numpy as np
+    import pandas as pd
+    from compact import compact_dataframe
+
+    seconds = np.arange(0, SECONDS_PER_DAY, grain_seconds(grain))
+    values = calculate_column_arrays(seconds, zone)
+    if compact:
+        return compact_dataframe(values, COLUMNS)
+    table = pd.DataFrame(values, columns=COLUMNS)
 
     return table
 
 
+def bucket(timestamps, grain="second"):
+    """
+    Takes timestamps (numpy datetime64, pandas datetimes or ints as epoch seconds) and returns the time_key
+    of the grain each falls into as an int64 array.  Timezone-aware pandas timestamps use their wall-clock time.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(timestamps, pd.Series) and getattr(timestamps.dt, "tz", None) is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    elif isinstance(timestamps, pd.DatetimeIndex) and timestamps.tz is not None:
+        timestamps = timestamps.tz_localize(None)
+
+    values = np.asarray(timestamps)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[s]")
+        seconds = (values - values.astype("datetime64[D]")).astype(np.int64)
+    else:
+        seconds = values.astype(np.int64) % SECONDS_PER_DAY
+
+    return seconds_to_time_keys(seconds - seconds % grain_seconds(grain))
+
+
+def enrich(keys, columns=None, zone="UTC"):
+    """
+    Takes a pandas Series or numpy array of time_keys and returns a DataFrame with the requested columns
+    (all by default) for every key.  The attributes are calculated once per distinct key and then taken
+    back out to the rows.
+    """
+    if columns is None:
+        columns = COLUMNS
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown time dimension columns: {unknown}")
+
+    def calculate(uniques):
+        seconds = time_keys_to_seconds(uniques)
+        invalid = (seconds < 0) | (seconds >= SECONDS_PER_DAY) | (seconds_to_time_keys(seconds) != uniques)
+        if invalid.any():
+            raise ValueError(f"{uniques[invalid][0]} is not a valid time_key")
+        return calculate_column_arrays(seconds, zone, columns)
+
+    return enrich_keys(keys, columns, calculate)
+
+
 if __name__ == "__main__":
+    from typed_output import write_parquet
+
     table = create_dataframe()
     table.to_csv("times.csv")
+    write_parquet(table, "times.parquet")
     print("Done")
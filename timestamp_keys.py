@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from key_codec import day_numbers_to_keys
+from time_dimension import SECONDS_PER_DAY, bucket
+
+# date_key and time_key of a null timestamp (NaT, None, NaN)
+NULL_KEY = -1
+
+
+def to_utc(timestamps):
+    """
+    Takes timestamps (timezone-aware pandas datetimes, numpy datetime64 taken as UTC, or ints as epoch seconds)
+    and returns them as a UTC pandas DatetimeIndex.
+    """
+    if isinstance(getattr(timestamps, "dtype", None), pd.DatetimeTZDtype):
+        return pd.DatetimeIndex(timestamps).tz_convert("UTC")
+
+    values = np.asarray(timestamps)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return pd.DatetimeIndex(values).tz_localize("UTC")
+    if np.issubdtype(values.dtype, np.number):
+        return pd.DatetimeIndex(pd.to_datetime(values, unit="s", utc=True))
+    # anything else, such as datetime objects with tzinfo, goes through pandas parsing
+    return pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+
+
+def zone_abbreviations(local, offsets):
+    """
+    Takes a timezone-aware pandas DatetimeIndex and the UTC offset of each timestamp and returns the zone
+    abbreviation (MST, MDT, ...) of each timestamp as an object array.  Abbreviations are looked up once per offset.
+    """
+    codes, uniques = pd.factorize(offsets)
+    first = np.zeros(len(uniques), dtype=np.int64)
+    first[codes[::-1]] = np.arange(len(codes))[::-1]
+    names = np.array([local[i].tzname() for i in first.tolist()], dtype=object)
+    return names[codes]
+
+
+def split_timestamps(timestamps, tz="UTC", grain="second"):
+    """
+    Takes timestamps (see to_utc()) and a target timezone name and returns the date_keys, time_keys (at the
+    given grain of time_dimension.GRAINS) and zone abbreviations of their local times as arrays.
+    Daylight saving time follows the timezone's rules, since every timestamp is converted from its UTC instant.
+    Null timestamps get NULL_KEY as date_key and time_key and None as zone abbreviation.
+    """
+    utc = to_utc(timestamps)
+    nulls = np.asarray(utc.isna())
+    if nulls.any():
+        date_keys = np.full(len(utc), NULL_KEY, dtype=np.int64)
+        time_keys = np.full(len(utc), NULL_KEY, dtype=np.int64)
+        zones = np.full(len(utc), None, dtype=object)
+        valid = ~nulls
+        if valid.any():
+            date_keys[valid], time_keys[valid], zones[valid] = split_timestamps(utc[valid], tz, grain)
+        return date_keys, time_keys, zones
+
+    local = utc.tz_convert(tz)
+    # wall-clock seconds in the target zone, counted from 1970-01-01 00:00:00 local time
+    ticks_per_second = int(np.timedelta64(1, "s") // np.timedelta64(1, utc.unit))
+    wall = local.tz_localize(None).asi8 // ticks_per_second
+    offsets = wall - utc.asi8 // ticks_per_second
+    date_keys = day_numbers_to_keys(wall // SECONDS_PER_DAY)
+    return date_keys, bucket(wall, grain), zone_abbreviations(local, offsets)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from compact import smallest_int_type
+
+# string columns holding dates and times, written as date32 and time32[s]
+DATE_COLUMNS = ["full_date", "week_begin_date"]
+TIME_COLUMNS = ["full_time"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("typed output needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def arrow_column(name, values):
+    """
+    Takes a column name and its pandas Series and returns the typed pyarrow array: dates as date32, times as
+    time32[s], bools as bool, ints in the smallest int type that holds them and repeating strings dictionary encoded.
+    """
+    pa = _pyarrow()
+    if name in DATE_COLUMNS:
+        return pa.array(values.to_numpy(dtype=object).astype("datetime64[D]"), type=pa.date32())
+    if name in TIME_COLUMNS:
+        seconds = pd.to_timedelta(values).to_numpy(dtype="timedelta64[s]").astype(np.int32)
+        return pa.array(seconds, type=pa.time32("s"))
+    if pd.api.types.is_bool_dtype(values):
+        return pa.array(values.to_numpy(dtype=bool))
+    if pd.api.types.is_integer_dtype(values):
+        ints = values.to_numpy(dtype=np.int64)
+        return pa.array(ints.astype(smallest_int_type(ints)))
+
+    strings = pa.array(values.to_numpy(dtype=object), type=pa.string())
+    if values.nunique() * 2 <= len(values):
+        return strings.dictionary_encode()
+    return strings
+
+
+def arrow_table(table):
+    """
+    Takes a dimension table DataFrame and returns it as a typed pyarrow Table, without the pandas index.
+    """
+    pa = _pyarrow()
+    arrays = [arrow_column(name, table[name]) for name in table.columns]
+    return pa.Table.from_arrays(arrays, names=[str(name) for name in table.columns])
+
+
+def write_parquet(table, path):
+    """
+    Takes a dimension table DataFrame and writes it as a typed Parquet file.
+    """
+    _pyarrow()
+    import pyarrow.parquet as pq
+
+    pq.write_table(arrow_table(table), path)
+
+
+def write_arrow(table, path):
+    """
+    Takes a dimension table DataFrame and writes it as a typed Arrow IPC (Feather v2) file.
+    """
+    _pyarrow()
+    import pyarrow.feather as feather
+
+    feather.write_feather(arrow_table(table), path)
+
+
+def read_table(path, columns=None):
+    """
+    Takes the path of a file written by write_parquet() or write_arrow() and returns the requested columns
+    (default: all) as a DataFrame, keeping the dictionary encoded columns as categoricals.
+    """
+    _pyarrow()
+    if str(path).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    import pyarrow.feather as feather
+
+    return feather.read_table(path, columns=columns).to_pandas()